@@ -0,0 +1,130 @@
+"""Compare applying a theme with and without matplotlib's per-key validation.
+
+Compiled themes are ``ValidatedStyle`` objects, so ``rcmod.set_style`` can
+write their values directly. The same values passed as a plain dict go
+through ``rcParams.__setitem__`` and are validated again, as before. Both
+are measured for a full apply (``delta=False``) and for a delta apply after
+switching from another theme. Resetting to the defaults after the theme is
+measured with a full reset and with an incremental one, which only restores
+the rcParams the theme changed. Before timing, ``check_reset`` makes sure
+both resets leave the same rcParams.
+
+    python benchmarks/bench_apply.py --repeat 200
+"""
+import argparse
+import json
+import os
+import sys
+
+import matplotlib as mpl
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyplot_themes import rcmod, themes  # noqa: E402
+from bench_themes import _median_seconds  # noqa: E402
+
+
+THEMES = ("matplotlib_default", "ucberkeley")
+
+
+def _rcparams():
+    return {key: dict.__getitem__(mpl.rcParams, key) for key in mpl.rcParams}
+
+
+def _differences(first, second):
+    return sorted(key for key in first.keys() | second.keys() if not first.get(key) == second.get(key))
+
+
+def check_reset(names=THEMES):
+    """Raise AssertionError if an incremental reset leaves other rcParams than a full one"""
+    scenarios = [
+        # the first reset in a process, after a theme
+        ("minimal", True, None),
+        # switching the notebook settings
+        ("dark", False, True),
+        ("dark", True, False),
+    ] + [(name, notebook, notebook) for name in names for notebook in (True, False)]
+    for name, notebook, previous in scenarios:
+        results = []
+        for incremental in (False, True):
+            # start like a fresh process
+            mpl.rcdefaults()
+            rcmod._reset_to = None
+            rcmod._modified.clear()
+            if previous is not None:
+                themes.theme_matplotlib_default(notebook=previous)
+            rcmod.set_style(themes.compile_theme(name))
+            themes.theme_matplotlib_default(notebook=notebook, incremental=incremental)
+            results.append(_rcparams())
+        differences = _differences(*results)
+        if differences:
+            raise AssertionError(
+                f"Incremental reset to notebook={notebook} after {name} differs in {differences}"
+            )
+
+
+def bench_apply(name, repeat=200):
+    """Return validating and validated apply timings, in microseconds, for one theme"""
+    validated = themes.compile_theme(name)
+    plain = dict(validated)
+    default = themes.compile_theme("matplotlib_default")
+    other = themes.compile_theme("dark")
+
+    def reset():
+        rcmod.set_style(default, delta=False)
+        rcmod.set_style(other)
+
+    result = {}
+    for label, style in (("validating", plain), ("validated", validated)):
+        result[f"{label}_full_us"] = _median_seconds(
+            lambda: rcmod.set_style(style, delta=False), reset, repeat
+        ) * 1e6
+        result[f"{label}_delta_us"] = _median_seconds(
+            lambda: rcmod.set_style(style), reset, repeat
+        ) * 1e6
+
+    def apply_theme():
+        themes.theme_matplotlib_default()
+        rcmod.set_style(validated)
+
+    for label, incremental in (("full", False), ("incremental", True)):
+        result[f"reset_{label}_us"] = _median_seconds(
+            lambda: themes.theme_matplotlib_default(incremental=incremental), apply_theme, repeat
+        ) * 1e6
+    rcmod.reset_style(default)
+    return result
+
+
+def run(names=THEMES, repeat=200):
+    """Check resets, then benchmark the given themes"""
+    check_reset(names)
+    return {name: bench_apply(name, repeat) for name in names}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--themes", nargs="+", default=list(THEMES))
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args.themes, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    print(f"{'theme':<20}{'':>12}{'validating':>12}{'validated':>12}{'speedup':>10}  (us)")
+    for name, result in results.items():
+        for mode in ("full", "delta"):
+            before = result[f"validating_{mode}_us"]
+            after = result[f"validated_{mode}_us"]
+            print(f"{name:<20}{mode:>12}{before:>12.1f}{after:>12.1f}{before / after:>9.1f}x")
+    print(f"\n{'reset after':<20}{'':>12}{'full':>12}{'incremental':>12}{'speedup':>10}  (us)")
+    for name, result in results.items():
+        before = result["reset_full_us"]
+        after = result["reset_incremental_us"]
+        print(f"{name:<20}{'':>12}{before:>12.1f}{after:>12.1f}{before / after:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
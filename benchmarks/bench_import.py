@@ -0,0 +1,99 @@
+"""Import-time regression benchmark for pyplot_themes.
+
+Every statement is timed in a fresh interpreter, so nothing is cached between
+runs. The script fails if a statement that should stay light pulls in
+``matplotlib.pyplot``, or if its median time exceeds ``--max-ms``.
+
+    python benchmarks/bench_import.py --repeat 7 --max-ms 500
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+
+# (label, statement, may import matplotlib.pyplot)
+STATEMENTS = [
+    ("import pyplot_themes", "import pyplot_themes", False),
+    ("palettes", "from pyplot_themes import palettes; palettes.Few.medium", False),
+    ("color index", "import pyplot_themes; pyplot_themes.find_color_hex_value('gray')", False),
+    ("theme_minimal", "import pyplot_themes; pyplot_themes.theme_minimal()", False),
+]
+
+_TIMER = """
+import sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(elapsed, "matplotlib.pyplot" in sys.modules)
+"""
+
+
+def time_statement(statement, repeat=5):
+    """Return the import timings in seconds and whether pyplot got imported"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT, os.environ.get("PYTHONPATH", "")]))
+    env.setdefault("MPLBACKEND", "Agg")
+    timings = []
+    imported_pyplot = False
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _TIMER.format(statement=statement)],
+            check=True,
+            capture_output=True,
+            text=True,
+            env=env,
+        ).stdout.split()
+        timings.append(float(out[-2]))
+        imported_pyplot = imported_pyplot or out[-1] == "True"
+    return timings, imported_pyplot
+
+
+def run(repeat=5):
+    """Time every statement and return one result dict per statement"""
+    results = []
+    for label, statement, pyplot_allowed in STATEMENTS:
+        timings, imported_pyplot = time_statement(statement, repeat)
+        results.append(
+            {
+                "name": label,
+                "median_ms": statistics.median(timings) * 1000,
+                "min_ms": min(timings) * 1000,
+                "imports_pyplot": imported_pyplot,
+                "pyplot_allowed": pyplot_allowed,
+            }
+        )
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=None)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat)
+    failures = []
+    for result in results:
+        if result["imports_pyplot"] and not result["pyplot_allowed"]:
+            failures.append(f"{result['name']} imported matplotlib.pyplot")
+        if args.max_ms is not None and result["median_ms"] > args.max_ms:
+            failures.append(f"{result['name']} took {result['median_ms']:.1f} ms")
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            print(f"{result['name']:<24} median {result['median_ms']:8.1f} ms  min {result['min_ms']:8.1f} ms")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
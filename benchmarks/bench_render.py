@@ -0,0 +1,136 @@
+"""End-to-end Agg render and savefig benchmarks under every theme.
+
+Each workload draws onto a fresh ``Figure`` with the theme applied through
+``pyplot_themes.theme``, then renders it with the Agg canvas and saves a PNG
+to memory. ``pyplot`` is never imported.
+
+    python benchmarks/bench_render.py --repeat 3 --workloads line bar
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+
+import pyplot_themes  # noqa: E402
+from bench_themes import theme_names  # noqa: E402
+
+
+def _data(scale=1.0):
+    rng = np.random.default_rng(42)
+    n_points = int(1_000_000 * scale)
+    return {
+        "line": (np.linspace(0, 10, 1000), rng.standard_normal((6, 1000)).cumsum(axis=1)),
+        "scatter": (rng.random(n_points), rng.random(n_points)),
+        "bar": (np.arange(12), rng.random((6, 12))),
+        "heatmap": rng.random((200, 200)),
+        "small_multiples": rng.standard_normal((16, 200)).cumsum(axis=1),
+    }
+
+
+def line(fig, data):
+    x, ys = data["line"]
+    ax = fig.subplots()
+    for y in ys:
+        ax.plot(x, y, label=f"series {len(ax.lines)}")
+    ax.legend()
+
+
+def scatter(fig, data):
+    x, y = data["scatter"]
+    fig.subplots().scatter(x, y, s=1)
+
+
+def bar(fig, data):
+    x, heights = data["bar"]
+    ax = fig.subplots()
+    width = 1 / (len(heights) + 1)
+    for i, h in enumerate(heights):
+        ax.bar(x + i * width, h, width=width)
+
+
+def heatmap(fig, data):
+    ax = fig.subplots()
+    fig.colorbar(ax.imshow(data["heatmap"]), ax=ax)
+
+
+def small_multiples(fig, data):
+    series = data["small_multiples"]
+    for ax, y in zip(fig.subplots(4, 4, sharex=True, sharey=True).flat, series):
+        ax.plot(y)
+        ax.set_title(f"{len(y)} points")
+
+
+WORKLOADS = {
+    "line": line,
+    "scatter": scatter,
+    "bar": bar,
+    "heatmap": heatmap,
+    "small_multiples": small_multiples,
+}
+
+
+def render(theme, workload, data):
+    """Return the (draw, savefig) times in seconds of one themed workload"""
+    with pyplot_themes.theme(theme):
+        fig = Figure()
+        canvas = FigureCanvasAgg(fig)
+        WORKLOADS[workload](fig, data)
+        start = time.perf_counter()
+        canvas.draw()
+        drawn = time.perf_counter()
+        fig.savefig(io.BytesIO(), format="png")
+        saved = time.perf_counter()
+    return drawn - start, saved - drawn
+
+
+def run(themes=None, workloads=None, repeat=3, scale=1.0):
+    """Benchmark every theme and workload, returning milliseconds"""
+    data = _data(scale)
+    results = {}
+    for theme in themes or theme_names():
+        results[theme] = {}
+        for workload in workloads or WORKLOADS:
+            timings = [render(theme, workload, data) for _ in range(repeat)]
+            results[theme][workload] = {
+                "draw_ms": statistics.median(t[0] for t in timings) * 1000,
+                "savefig_ms": statistics.median(t[1] for t in timings) * 1000,
+            }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--themes", nargs="+", default=None)
+    parser.add_argument("--workloads", nargs="+", choices=list(WORKLOADS), default=None)
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="fraction of the 1M scatter points to draw"
+    )
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args.themes, args.workloads, args.repeat, args.scale)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    for theme, workloads in results.items():
+        for workload, result in workloads.items():
+            print(
+                f"{theme:<20}{workload:<16} draw {result['draw_ms']:8.1f} ms"
+                f"  savefig {result['savefig_ms']:8.1f} ms"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""Time and allocation benchmarks for building and applying every theme.
+
+For each ``theme_*`` function this measures:
+
+* ``build``: the uncached style builder, i.e. ``rcmod.theme_style`` and friends
+* ``compile``: a cached ``compile_theme`` lookup
+* ``apply``: ``rcmod.set_style`` of the theme right after a reset (delta apply)
+* ``apply_full``: the same with ``delta=False``, writing every key
+
+    python benchmarks/bench_themes.py --repeat 50
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pyplot_themes  # noqa: E402
+from pyplot_themes import rcmod, registry, themes  # noqa: E402
+
+
+def theme_names():
+    """Return the theme names behind every distinct ``theme_*`` function"""
+    names = []
+    seen = set()
+    for name in registry.available_themes():
+        builder = registry.get_theme(name)
+        if builder not in seen:
+            seen.add(builder)
+            names.append(builder.theme_name)
+    return sorted(names)
+
+
+def _median_seconds(func, setup=None, repeat=50):
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def _allocations(func, setup=None):
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    try:
+        func()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    count = sum(stat.count for stat in snapshot.statistics("filename"))
+    return {"blocks": count, "peak_bytes": peak}
+
+
+def bench_theme(name, repeat=50):
+    """Return the timings, in microseconds, and allocations for one theme"""
+    builder = registry.get_theme(name)
+    build = builder.__wrapped__
+    style = themes.compile_theme(name)
+    default = themes.compile_theme("matplotlib_default")
+
+    def reset():
+        rcmod.set_style(default)
+
+    result = {
+        "build_us": _median_seconds(build, repeat=repeat) * 1e6,
+        "compile_us": _median_seconds(lambda: themes.compile_theme(name), repeat=repeat) * 1e6,
+        "apply_us": _median_seconds(lambda: rcmod.set_style(style), reset, repeat) * 1e6,
+        "apply_full_us": _median_seconds(
+            lambda: rcmod.set_style(style, delta=False), reset, repeat
+        ) * 1e6,
+        "build_alloc": _allocations(build),
+        "apply_alloc": _allocations(lambda: rcmod.set_style(style), reset),
+    }
+    reset()
+    return result
+
+
+def run(names=None, repeat=50):
+    """Benchmark the given themes, all of them by default"""
+    return {name: bench_theme(name, repeat) for name in (names or theme_names())}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--themes", nargs="+", default=None)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args.themes, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    print(f"{'theme':<20}{'build':>10}{'compile':>10}{'apply':>10}{'full':>10}  (us)")
+    for name, result in results.items():
+        print(
+            f"{name:<20}{result['build_us']:>10.1f}{result['compile_us']:>10.1f}"
+            f"{result['apply_us']:>10.1f}{result['apply_full_us']:>10.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
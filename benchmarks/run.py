@@ -0,0 +1,125 @@
+"""Run every benchmark and append the results to a JSON lines history file.
+
+Each run is stored as one JSON object holding the environment (git commit,
+python, matplotlib and platform) and flat ``metric name -> value`` pairs.
+The run is compared with the latest earlier run from the same environment,
+and any metric that got slower by more than ``--tolerance`` is reported.
+
+    python benchmarks/run.py                        # full suite
+    python benchmarks/run.py --quick --fail-on-regression
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+
+import matplotlib
+
+import bench_apply
+import bench_import
+import bench_render
+import bench_themes
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_HISTORY = os.path.join(HERE, "results", "history.jsonl")
+
+
+def environment():
+    """Describe where the benchmarks ran, used to pick comparable runs"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=HERE, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "matplotlib": matplotlib.__version__,
+        "machine": f"{platform.system()}-{platform.machine()}-{platform.node()}",
+    }
+
+
+def _flatten(prefix, value, out):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            _flatten(f"{prefix}.{key}", item, out)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        out[prefix] = value
+    return out
+
+
+def collect(quick=False):
+    """Run all benchmarks and return flat metrics"""
+    metrics = {}
+    for result in bench_import.run(repeat=3 if quick else 7):
+        metrics[f"import.{result['name']}.median_ms"] = result["median_ms"]
+    _flatten("themes", bench_themes.run(repeat=10 if quick else 50), metrics)
+    _flatten("apply", bench_apply.run(repeat=20 if quick else 200), metrics)
+    render = bench_render.run(repeat=1 if quick else 3, scale=0.1 if quick else 1.0)
+    _flatten("render", render, metrics)
+    return metrics
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def find_regressions(previous, current, tolerance):
+    """Return (metric, before, after) for metrics slower by more than ``tolerance``"""
+    regressions = []
+    for name, after in current.items():
+        before = previous.get(name)
+        if before and after > before * (1 + tolerance):
+            regressions.append((name, before, after))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--history", default=DEFAULT_HISTORY)
+    parser.add_argument("--quick", action="store_true", help="fewer repeats, smaller workloads")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--no-save", action="store_true", help="do not append to the history")
+    args = parser.parse_args(argv)
+
+    env = environment()
+    record = {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "quick": args.quick,
+        "environment": env,
+        "metrics": collect(args.quick),
+    }
+
+    comparable = [
+        run for run in load_history(args.history)
+        if run["quick"] == args.quick
+        and {k: v for k, v in run["environment"].items() if k != "commit"}
+        == {k: v for k, v in env.items() if k != "commit"}
+    ]
+    regressions = []
+    if comparable:
+        previous = comparable[-1]
+        regressions = find_regressions(previous["metrics"], record["metrics"], args.tolerance)
+        print(f"compared with {previous['environment']['commit']} from {previous['timestamp']}")
+    for name, before, after in regressions:
+        print(f"REGRESSION {name}: {before:.2f} -> {after:.2f}")
+    print(f"{len(record['metrics'])} metrics, {len(regressions)} regressions")
+
+    if not args.no_save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.history)), exist_ok=True)
+        with open(args.history, "a") as f:
+            f.write(json.dumps(record, sort_keys=True) + "\n")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,293 @@
+"""Render reference plots under every theme and compare them with baselines.
+
+Six fixed plots are drawn for every registered theme and each of its
+schemes and palette options. Cases are spread over worker processes. Each
+render is reduced to a fingerprint: its OKLab block means on a 32 x 32 grid,
+quantized and hashed. A render whose fingerprint matches the stored one
+passes without opening the baseline image, as no block's color moved by a
+full quantization step. Only on a mismatch is the baseline PNG loaded and
+compared pixel by pixel with CIELAB Delta E. Failing renders and their diff
+masks are written to ``--output``.
+
+Baselines depend on the installed fonts and FreeType, so create them on the
+machine that runs the check::
+
+    python golden/run.py --update        # write baselines/*.png and fingerprints.json
+    python golden/run.py                 # check, exit code 1 on differences
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+import matplotlib.image as mpl_image  # noqa: E402
+
+import pyplot_themes  # noqa: E402
+from pyplot_themes import colorspace, palettes, registry  # noqa: E402
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINES = os.path.join(HERE, "baselines")
+FINGERPRINTS = "fingerprints.json"
+
+FIGSIZE = (6.0, 4.0)
+DPI = 60
+GRID = 32
+QUANTUM = 0.02
+
+# the schemes and palette options of each theme, other themes run with defaults
+VARIANTS = {
+    "matplotlib_default": [{"notebook": True}, {"notebook": False}],
+    "minimal": [{}, {"palette": list(palettes.PaulTolColorSchemes.colors)}],
+    "dark": [{}, {"palette": list(palettes.FiveThirtyEight.colors)}],
+    "solarized": [{"scheme": "dark"}, {"scheme": "light"}],
+    "paul_tol": [{}, {"reverse_colors": True}],
+    "few": [{"scheme": "medium"}, {"scheme": "light"}, {"scheme": "dark"}],
+    "ucberkeley": [{"scheme": "primary"}, {"scheme": "secondary"}, {"scheme": "all"}],
+    "ggplot2": [{}, {"palette": list(palettes.Autumn1.colors)}],
+    "bmh": [{}, {"palette": list(palettes.Canyon.colors)}],
+}
+
+
+def _data():
+    rng = np.random.default_rng(7)
+    return {
+        "line": (np.linspace(0, 10, 200), rng.standard_normal((6, 200)).cumsum(axis=1)),
+        "scatter": rng.random((6, 2, 60)),
+        "bar": rng.random((4, 8)),
+        "hist": rng.standard_normal((3, 500)),
+        "heatmap": rng.random((20, 30)),
+        "text": rng.random(10).cumsum(),
+    }
+
+
+def plot_line(ax, data):
+    x, ys = data["line"]
+    for i, y in enumerate(ys):
+        ax.plot(x, y, label=f"series {i}")
+    ax.legend()
+
+
+def plot_scatter(ax, data):
+    for x, y in data["scatter"]:
+        ax.scatter(x, y)
+
+
+def plot_bar(ax, data):
+    heights = data["bar"]
+    width = 1 / (len(heights) + 1)
+    for i, h in enumerate(heights):
+        ax.bar(np.arange(len(h)) + i * width, h, width=width)
+
+
+def plot_hist(ax, data):
+    for values in data["hist"]:
+        ax.hist(values, bins=30, alpha=0.6)
+
+
+def plot_heatmap(ax, data):
+    ax.figure.colorbar(ax.imshow(data["heatmap"]), ax=ax)
+
+
+def plot_text(ax, data):
+    ax.plot(data["text"], marker="o")
+    ax.set_title("Title")
+    ax.set_xlabel("x label")
+    ax.set_ylabel("y label")
+    ax.annotate("peak", (9, data["text"][-1]), xytext=(5, data["text"][-1]), arrowprops={})
+
+
+PLOTS = {
+    "line": plot_line,
+    "scatter": plot_scatter,
+    "bar": plot_bar,
+    "hist": plot_hist,
+    "heatmap": plot_heatmap,
+    "text": plot_text,
+}
+
+
+def cases(names=None):
+    """Return ``(case id, theme, kwargs)`` for every theme variant"""
+    found = []
+    seen = set()
+    for name in names or registry.available_themes():
+        builder = registry.get_theme(name)
+        if builder in seen:
+            continue
+        seen.add(builder)
+        name = builder.theme_name
+        for kwargs in VARIANTS.get(name, [{}]):
+            suffix = "-".join(f"{k}_{_label(v)}" for k, v in sorted(kwargs.items()))
+            found.append((f"{name}-{suffix}" if suffix else name, name, kwargs))
+    return found
+
+
+def _label(value):
+    if isinstance(value, list):
+        return hashlib.sha1(repr(value).encode()).hexdigest()[:8]
+    return str(value).lower()
+
+
+def render(theme, kwargs, plot):
+    """Draw one reference plot under a theme and return it as an H x W x 4 uint8 array"""
+    with pyplot_themes.theme(theme, **kwargs):
+        fig = Figure(figsize=FIGSIZE, dpi=DPI)
+        canvas = FigureCanvasAgg(fig)
+        PLOTS[plot](fig.subplots(), _DATA)
+        canvas.draw()
+        return np.asarray(canvas.buffer_rgba()).copy()
+
+
+def fingerprint(rgba):
+    """Hash the quantized OKLab block means of an image"""
+    height, width = rgba.shape[:2]
+    rows = np.linspace(0, height, GRID + 1).astype(int)
+    cols = np.linspace(0, width, GRID + 1).astype(int)
+    lab = colorspace.rgb_to_oklab(rgba[..., :3] / 255.0)
+    # block sums through a 2-D cumulative sum, then divided by block areas
+    total = np.zeros((height + 1, width + 1, 3))
+    total[1:, 1:] = lab.cumsum(axis=0).cumsum(axis=1)
+    sums = (
+        total[rows[1:]][:, cols[1:]] - total[rows[:-1]][:, cols[1:]]
+        - total[rows[1:]][:, cols[:-1]] + total[rows[:-1]][:, cols[:-1]]
+    )
+    areas = np.outer(np.diff(rows), np.diff(cols))[..., np.newaxis]
+    quantized = np.floor(sums / areas / QUANTUM).astype(np.int16)
+    header = np.array([height, width], dtype=np.int32).tobytes()
+    return hashlib.sha1(header + quantized.tobytes()).hexdigest()
+
+
+def delta_e(rgba, baseline):
+    """Return the per-pixel CIELAB Delta E of two images of the same shape"""
+    first = colorspace.rgb_to_cielab(rgba[..., :3] / 255.0)
+    second = colorspace.rgb_to_cielab(baseline[..., :3] / 255.0)
+    return np.sqrt(((first - second) ** 2).sum(axis=-1))
+
+
+def _load_png(path):
+    image = mpl_image.imread(path)
+    if image.dtype != np.uint8:
+        image = np.round(image * 255).astype(np.uint8)
+    return image
+
+
+def _load_fingerprints(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _init_worker():
+    global _DATA
+    _DATA = _data()
+    # missing theme fonts fall back to DejaVu Sans, the same way for baselines and checks
+    logging.getLogger("matplotlib.font_manager").setLevel(logging.ERROR)
+
+
+def check_case(case, baseline_dir, expected, output_dir, update, tolerance, max_fraction):
+    """Render and check, or store, all plots of one case"""
+    case_id, theme, kwargs = case
+    results = []
+    for plot in PLOTS:
+        name = f"{case_id}-{plot}"
+        rgba = render(theme, kwargs, plot)
+        digest = fingerprint(rgba)
+        result = {"name": name, "fingerprint": digest, "status": "ok", "detail": ""}
+        baseline_path = os.path.join(baseline_dir, f"{name}.png")
+        if update:
+            mpl_image.imsave(baseline_path, rgba)
+            result["status"] = "updated"
+        elif name not in expected or not os.path.exists(baseline_path):
+            result.update(status="missing", detail="no baseline, run with --update")
+        elif expected[name] != digest:
+            baseline = _load_png(baseline_path)
+            if baseline.shape != rgba.shape:
+                result.update(status="failed", detail=f"size {rgba.shape[:2]} != {baseline.shape[:2]}")
+            else:
+                distance = delta_e(rgba, baseline)
+                fraction = float((distance > tolerance).mean())
+                detail = f"{fraction:.3%} of pixels over Delta E {tolerance}, max {distance.max():.1f}"
+                if fraction > max_fraction:
+                    result.update(status="failed", detail=detail)
+                    if output_dir:
+                        mpl_image.imsave(os.path.join(output_dir, f"{name}.png"), rgba)
+                        mpl_image.imsave(
+                            os.path.join(output_dir, f"{name}-diff.png"),
+                            distance, cmap="magma", vmin=0, vmax=max(tolerance * 4, 1),
+                        )
+                else:
+                    result.update(status="close", detail=detail)
+        results.append(result)
+    return results
+
+
+def run(names=None, baseline_dir=DEFAULT_BASELINES, output_dir=None, update=False,
+        workers=None, tolerance=5.0, max_fraction=0.001):
+    """Check, or with ``update`` store, every case and return the results"""
+    os.makedirs(baseline_dir, exist_ok=True)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    manifest = os.path.join(baseline_dir, FINGERPRINTS)
+    expected = _load_fingerprints(manifest)
+
+    selected = cases(names)
+    arguments = (baseline_dir, expected, output_dir, update, tolerance, max_fraction)
+    results = []
+    with ProcessPoolExecutor(workers, initializer=_init_worker) as pool:
+        futures = [pool.submit(check_case, case, *arguments) for case in selected]
+        for future in futures:
+            results.extend(future.result())
+
+    if update:
+        # updating only some themes keeps the fingerprints of the others
+        fingerprints = {} if names is None else expected
+        fingerprints.update({r["name"]: r["fingerprint"] for r in results})
+        with open(manifest, "w") as f:
+            json.dump(fingerprints, f, indent=1, sort_keys=True)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--update", action="store_true", help="write new baselines")
+    parser.add_argument("--themes", nargs="+", default=None)
+    parser.add_argument("--baselines", default=DEFAULT_BASELINES)
+    parser.add_argument("--output", default=None, help="directory for failing renders and diffs")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--tolerance", type=float, default=5.0, help="Delta E a pixel may differ by")
+    parser.add_argument(
+        "--max-fraction", type=float, default=0.001,
+        help="fraction of pixels allowed over the tolerance",
+    )
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = run(
+        args.themes, args.baselines, args.output, args.update,
+        args.workers, args.tolerance, args.max_fraction,
+    )
+    elapsed = time.perf_counter() - start
+    counts = {}
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+        if result["status"] in ("failed", "missing", "close"):
+            print(f"{result['status']:<8}{result['name']:<48}{result['detail']}")
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+    print(f"{len(results)} renders in {elapsed:.1f}s: {summary}")
+    return 1 if counts.get("failed") or counts.get("missing") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
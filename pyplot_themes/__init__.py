@@ -1,19 +1,101 @@
-from .themes import (
-    create_palette,
-    list_available_colors,
-    theme_bayesian_methods_for_hackers,
-    theme_bmh,
-    theme_dark,
-    theme_few,
-    theme_fivethirtyeight,
-    theme_ggplot2,
-    theme_matplotlib_default,
-    theme_minimal,
-    theme_paul_tol,
-    theme_reset,
-    theme_solarized_light2,
-    theme_solarized,
-    theme_tableau,
-    theme_ucberkeley,
-)
+"""Themes you can see that apply to matplotlib, seaborn, and pandas plots.
+
+Submodules and the public functions below are imported on first attribute
+access (PEP 562), so ``import pyplot_themes`` stays cheap and only pulls in
+matplotlib once a theme or color lookup is actually used.
+"""
+import importlib
+
 from .__version__ import __version__
+
+
+_LAZY_ATTRIBUTES = {
+    "CategoryColors": "categories",
+    "Theme": "themes",
+    "ThemeLayers": "layers",
+    "ValidatedStyle": "validated",
+    "apply": "registry",
+    "available_themes": "registry",
+    "get_theme": "registry",
+    "register_theme": "registry",
+    "compile_theme": "themes",
+    "create_palette": "themes",
+    "theme": "themes",
+    "theme_bayesian_methods_for_hackers": "themes",
+    "theme_bmh": "themes",
+    "theme_dark": "themes",
+    "theme_few": "themes",
+    "theme_fivethirtyeight": "themes",
+    "theme_ggplot2": "themes",
+    "theme_matplotlib_default": "themes",
+    "theme_minimal": "themes",
+    "theme_paul_tol": "themes",
+    "theme_reset": "themes",
+    "theme_solarized_light2": "themes",
+    "theme_solarized": "themes",
+    "theme_tableau": "themes",
+    "theme_ucberkeley": "themes",
+    "find_color_hex_value": "colornames",
+    "find_color_hex_values": "colornames",
+    "list_available_colors": "colornames",
+    "nearest_color_names": "colornames",
+    "suggest_colors": "colornames",
+    "generate_palette": "palettes",
+    "palette_from_image": "extract",
+    "resample_palette": "palettes",
+    "validate_palette": "accessibility",
+    "validate_palettes": "accessibility",
+    "render_batch": "batch",
+    "series_colors": "series",
+    "retheme": "figures",
+    "warm_fonts": "fonts",
+    "apply_theme_file": "serialize",
+    "export_theme": "serialize",
+    "load_theme": "serialize",
+    "get_colormap": "colormaps",
+    "register_colormaps": "colormaps",
+    "clear_theme_cache": "cache",
+    "set_theme_cache_size": "cache",
+    "theme_cache_info": "cache",
+}
+
+_SUBMODULES = {
+    "accessibility",
+    "batch",
+    "cache",
+    "categories",
+    "colormaps",
+    "colornames",
+    "colorspace",
+    "extract",
+    "files",
+    "figures",
+    "fonts",
+    "instrument",
+    "layers",
+    "palettes",
+    "rcmod",
+    "registry",
+    "series",
+    "serialize",
+    "themes",
+    "validated",
+}
+
+__all__ = sorted(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(f".{_LAZY_ATTRIBUTES[name]}", __name__)
+        value = getattr(module, name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | _SUBMODULES)
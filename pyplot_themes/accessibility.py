@@ -0,0 +1,210 @@
+"""Check that palettes stay distinguishable under color vision deficiencies.
+
+Every palette is simulated as seen with protanopia, deuteranopia and
+tritanopia (Machado et al. 2009, full severity) and in grayscale, and the
+CIELAB color difference (Delta E 1976) between every pair of its colors is
+computed. Palettes of the same length are stacked so they are checked in a
+few NumPy passes, each with a bounded number of pairs so one very long
+palette cannot exhaust memory, and results are cached per palette content.
+
+Run ``python -m pyplot_themes.accessibility [palettes.json]`` to check the
+built-in palettes, or a JSON file of ``{"name": ["#hex", ...]}``, in CI.
+"""
+import hashlib
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+import pyplot_themes.colorspace as colorspace
+import pyplot_themes.palettes as palettes
+
+
+CONDITIONS = ("normal", "protan", "deutan", "tritan", "grayscale")
+# grayscale is reported but, like most categorical palettes, not required
+REQUIRED_CONDITIONS = ("normal", "protan", "deutan", "tritan")
+
+# Machado, Oliveira and Fernandes (2009), severity 1.0, applied to linear RGB
+_SIMULATIONS = np.array(
+    [
+        np.eye(3),
+        [
+            [0.152286, 1.052583, -0.204868],
+            [0.114503, 0.786281, 0.099216],
+            [-0.003882, -0.048116, 1.051998],
+        ],
+        [
+            [0.367322, 0.860646, -0.227968],
+            [0.280085, 0.672501, 0.047413],
+            [-0.011820, 0.042940, 0.968881],
+        ],
+        [
+            [1.255528, -0.076749, -0.178779],
+            [-0.078411, 0.930809, 0.147602],
+            [0.004733, 0.691367, 0.303900],
+        ],
+        # relative luminance copied into every channel
+        [[0.2126, 0.7152, 0.0722]] * 3,
+    ]
+)
+
+PalettePair = namedtuple("PalettePair", ["first", "second", "delta_e"])
+PaletteReport = namedtuple("PaletteReport", ["name", "min_delta_e", "worst_pairs", "passed"])
+
+_cache = {}
+
+# color pairs Delta E is computed for in one pass, about 32 MB per float64 array
+_MAX_PAIRS = 1 << 22
+
+
+def _content_key(hex_values):
+    return hashlib.sha1("|".join(hex_values).encode()).hexdigest()
+
+
+def simulate(rgb, condition):
+    """Return how an N x 3 sRGB array looks under ``condition``
+    Parameters
+    ----------
+    rgb : array
+        sRGB values in [0, 1], with shape ``(..., 3)``
+    condition : str
+        One of normal, protan, deutan, tritan or grayscale
+    """
+    if condition not in CONDITIONS:
+        raise ValueError(f"Condition must be one of {', '.join(CONDITIONS)}, not {condition!r}")
+    matrix = _SIMULATIONS[CONDITIONS.index(condition)]
+    return colorspace.linear_to_srgb(np.clip(colorspace.srgb_to_linear(rgb) @ matrix.T, 0, 1))
+
+
+def _delta_e_matrices(hex_palettes):
+    """Return a (palettes, conditions, n, n) Delta E array for palettes of the same length"""
+    rgb = np.array([colorspace.hex_to_rgb(hex_values) for hex_values in hex_palettes])
+    linear = colorspace.srgb_to_linear(rgb)
+    # (palettes, conditions, colors, channels)
+    simulated = np.clip(np.einsum("cij,pnj->pcni", _SIMULATIONS, linear), 0, 1)
+    lab = colorspace.rgb_to_cielab(colorspace.linear_to_srgb(simulated))
+    # one channel at a time, so no (..., n, n, 3) array is needed
+    squared = np.zeros(lab.shape[:-1] + (lab.shape[-2],))
+    for c in range(3):
+        channel = lab[..., c]
+        squared += (channel[..., :, np.newaxis] - channel[..., np.newaxis, :]) ** 2
+    return np.sqrt(squared)
+
+
+def _batches(hex_palettes):
+    """Group palettes by length, in chunks of at most ``_MAX_PAIRS`` color pairs"""
+    by_length = {}
+    for key, hex_values in hex_palettes.items():
+        by_length.setdefault(len(hex_values), []).append(key)
+    for n, keys in by_length.items():
+        size = max(1, _MAX_PAIRS // (len(CONDITIONS) * n * n))
+        for start in range(0, len(keys), size):
+            yield keys[start:start + size]
+
+
+def _report(name, hex_values, delta_e, threshold, worst, required):
+    n = len(hex_values)
+    rows, cols = np.triu_indices(n, k=1)
+    min_delta_e = {}
+    worst_pairs = {}
+    for c, condition in enumerate(CONDITIONS):
+        pair_delta_e = delta_e[c][rows, cols]
+        order = np.argsort(pair_delta_e, kind="stable")[:worst]
+        worst_pairs[condition] = [
+            PalettePair(hex_values[rows[i]], hex_values[cols[i]], float(pair_delta_e[i]))
+            for i in order
+        ]
+        min_delta_e[condition] = float(pair_delta_e[order[0]]) if len(order) else float("inf")
+    passed = all(min_delta_e[condition] >= threshold for condition in required)
+    return PaletteReport(name, min_delta_e, worst_pairs, passed)
+
+
+def validate_palettes(named_palettes, threshold=10.0, worst=3, required=REQUIRED_CONDITIONS):
+    """Check many palettes at once
+    Parameters
+    ----------
+    named_palettes : dict
+        Palette names mapped to lists of colors, e.g. ``builtin_palettes()``
+    threshold : float, 10.0
+        The smallest Delta E between two colors, under every condition, for a
+        palette to pass
+    worst : int, 3
+        How many of the closest pairs to report for each condition
+    required : tuple, ("normal", "protan", "deutan", "tritan")
+        The conditions that must meet ``threshold`` for a palette to pass
+    Returns
+    -------
+    dict
+        Palette names mapped to ``PaletteReport`` named tuples
+    """
+    from matplotlib.colors import to_hex
+
+    normalized = {name: [to_hex(c) for c in colors] for name, colors in named_palettes.items()}
+    keys = {name: _content_key(hex_values) for name, hex_values in normalized.items()}
+    missing = {}
+    for name, key in keys.items():
+        if key not in _cache and len(normalized[name]) > 0:
+            missing.setdefault(key, normalized[name])
+    for batch in _batches(missing):
+        matrices = _delta_e_matrices([missing[key] for key in batch])
+        matrices.setflags(write=False)
+        for key, matrix in zip(batch, matrices):
+            _cache[key] = matrix
+    reports = {}
+    for name, hex_values in normalized.items():
+        delta_e = _cache.get(keys[name], np.zeros((len(CONDITIONS), 0, 0)))
+        reports[name] = _report(name, hex_values, delta_e, threshold, worst, required)
+    return reports
+
+
+def validate_palette(palette, threshold=10.0, worst=3, required=REQUIRED_CONDITIONS, name="palette"):
+    """Check a single palette, see ``validate_palettes``"""
+    return validate_palettes({name: palette}, threshold, worst, required)[name]
+
+
+def builtin_palettes():
+    """Return every palette in ``pyplot_themes.palettes`` keyed by ``Class.attribute``"""
+    found = {}
+    for class_name, group in vars(palettes).items():
+        if not isinstance(group, type) or group is palettes.Palette:
+            continue
+        for attribute, value in vars(group).items():
+            if isinstance(value, palettes.Palette):
+                found[f"{class_name}.{attribute}"] = value
+    return found
+
+
+def clear_cache():
+    """Forget every cached Delta E matrix"""
+    _cache.clear()
+
+
+def main(argv=None):
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Check palettes for color vision accessibility")
+    parser.add_argument("path", nargs="?", help='JSON file of {"name": ["#hex", ...]}')
+    parser.add_argument("--threshold", type=float, default=10.0)
+    parser.add_argument(
+        "--require", nargs="+", choices=CONDITIONS, default=list(REQUIRED_CONDITIONS),
+        help="conditions every palette must pass",
+    )
+    args = parser.parse_args(argv)
+
+    if args.path:
+        with open(args.path) as f:
+            named_palettes = json.load(f)
+    else:
+        named_palettes = builtin_palettes()
+    reports = validate_palettes(named_palettes, args.threshold, required=args.require)
+    for report in reports.values():
+        worst = min(args.require, key=report.min_delta_e.get)
+        pair = report.worst_pairs[worst][0] if report.worst_pairs[worst] else None
+        detail = f"{worst}: {pair.first} / {pair.second} Delta E {pair.delta_e:.1f}" if pair else ""
+        print(f"{'ok  ' if report.passed else 'FAIL'} {report.name:<28} {detail}")
+    return 0 if all(report.passed for report in reports.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
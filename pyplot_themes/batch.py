@@ -0,0 +1,105 @@
+"""Render many plots with one theme over a pool of worker processes.
+
+Each worker applies the theme once, when it starts, instead of once per
+figure, and closes every figure after each item so memory stays bounded.
+"""
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import pyplot_themes.rcmod as rcmod
+from pyplot_themes import registry, themes
+
+
+def _init_worker(theme, theme_args, theme_kwargs, backend):
+    import matplotlib
+
+    matplotlib.use(backend)
+    rcmod.set_style(themes.compile_theme(theme, *theme_args, **theme_kwargs))
+
+
+def _render_item(plot_fn, index, item):
+    import matplotlib.pyplot as plt
+
+    try:
+        return index, plot_fn(item)
+    finally:
+        plt.close("all")
+
+
+def render_batch(
+    plot_fn,
+    items,
+    theme="minimal",
+    workers=None,
+    theme_args=(),
+    theme_kwargs=None,
+    ordered=False,
+    max_pending=None,
+    backend="Agg",
+):
+    """Call ``plot_fn(item)`` for every item in worker processes with a theme applied
+    Results are yielded as soon as they are ready, as ``(index, result)``
+    tuples where ``index`` is the position of the item in ``items``.
+    ``plot_fn`` must be importable by the workers, i.e. defined at module
+    level, and should save its figure and return something small, such as
+    the file name or the PNG bytes.
+    Parameters
+    ----------
+    plot_fn : function
+        Draws and saves one plot for an item, with pyplot or Figure objects
+    items : iterable
+        The items to plot, consumed lazily
+    theme : str or function, minimal
+        The theme name, e.g. ``"few"``, or the ``theme_*`` function
+    workers : int, None
+        The number of processes, defaults to the number of CPUs
+    theme_args : tuple, ()
+        Positional arguments for the theme
+    theme_kwargs : dict, None
+        Keyword arguments for the theme, e.g. ``{"scheme": "dark"}``
+    ordered : bool, False
+        Yield results in the order of ``items`` instead of as they finish
+    max_pending : int, None
+        The most items submitted at once, defaults to four per worker
+    backend : str, Agg
+        The matplotlib backend the workers use
+    Examples
+    --------
+    >>> for index, path in render_batch(save_chart, rows, theme="few", workers=8):
+    ...     print(index, path)
+    """
+    theme = registry.get_theme(theme).theme_name
+    initargs = (theme, tuple(theme_args), dict(theme_kwargs or {}), backend)
+    workers = workers or os.cpu_count() or 1
+    limit = max_pending or 4 * workers
+    items = iter(enumerate(items))
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=initargs) as pool:
+        pending = set()
+        finished = {}
+        next_index = 0
+
+        def submit():
+            for index, item in items:
+                pending.add(pool.submit(_render_item, plot_fn, index, item))
+                if len(pending) >= limit:
+                    return
+
+        try:
+            submit()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                pending.difference_update(done)
+                for future in done:
+                    index, result = future.result()
+                    if not ordered:
+                        yield index, result
+                    else:
+                        finished[index] = result
+                while next_index in finished:
+                    yield next_index, finished.pop(next_index)
+                    next_index += 1
+                submit()
+        finally:
+            # stopped early or an item failed, so drop what has not started
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,187 @@
+"""Memoized, compiled theme styles.
+
+Building a theme means resolving color names, creating a ``cycler`` and
+merging several dicts. The result only depends on the theme and the
+arguments it was called with, so the compiled style is cached here keyed on
+``(theme name, normalized arguments)`` and handed out as a read-only mapping.
+"""
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from pyplot_themes import instrument
+from pyplot_themes.layers import ThemeLayers
+from pyplot_themes.validated import ValidatedStyle
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class ThemeCache:
+    """A thread-safe LRU cache of compiled theme styles.
+
+    Parameters
+    ----------
+    maxsize : int, 128
+        The maximum number of compiled styles to keep. The least recently
+        used entry is evicted once the cache is full.
+    """
+
+    def __init__(self, maxsize=128):
+        self._maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key, build):
+        """Return the style stored under ``key``, calling ``build`` on a miss"""
+        with self._lock:
+            style = self._entries.get(key)
+            if style is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return style
+            self._misses += 1
+        style = build()
+        with self._lock:
+            self._entries[key] = style
+            self._entries.move_to_end(key)
+            self._evict()
+        return style
+
+    def discard(self, name):
+        """Drop every cached style of the theme called ``name``"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == name]:
+                del self._entries[key]
+
+    def _evict(self):
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def info(self):
+        """Return hit/miss statistics as a ``CacheInfo`` named tuple"""
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._maxsize, len(self._entries))
+
+    def clear(self):
+        """Drop every cached style and reset the statistics"""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def resize(self, maxsize):
+        """Change the maximum size, evicting entries if needed"""
+        if maxsize < 0:
+            raise ValueError("maxsize must be zero or a positive integer")
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+
+_theme_cache = ThemeCache()
+
+# distinct calls per theme whose bound cache key is remembered
+_MAX_BOUND_KEYS = 1024
+
+# rcParams merged over a theme's own style when it is built, by theme name,
+# e.g. the font stacks resolved by ``fonts.warm_fonts``
+_overrides = {}
+
+
+def _normalize(value):
+    """Turn an argument into a hashable value that compares by content"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _normalize(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_normalize(v) for v in value)
+    return value
+
+
+def compiled_theme(name):
+    """Decorator caching the style dict returned by a theme builder.
+
+    Positional and keyword arguments are bound against the builder's
+    signature (defaults included) before building the key, so
+    ``builder([9, 6])`` and ``builder(figsize=(9.0, 6.0))`` share an entry.
+    Binding costs more than building most themes, so the bound key of each
+    distinct call is remembered and repeated calls skip it.
+
+    Parameters
+    ----------
+    name : str
+        The name of the theme, used as the first part of the cache key.
+    """
+
+    def decorator(builder):
+        signature = inspect.signature(builder)
+        # call arguments, as given, mapped to their signature-bound cache key
+        bound_keys = {}
+
+        @functools.wraps(builder)
+        def wrapper(*args, **kwargs):
+            def build():
+                start = time.perf_counter() if instrument.enabled else None
+                style = ThemeLayers(builder(*args, **kwargs), _overrides.get(name))
+                style = ValidatedStyle.validate(style, name)
+                if start is not None:
+                    instrument.record("compile", time.perf_counter() - start)
+                return style
+
+            call = (_normalize(args), _normalize(kwargs) if kwargs else ())
+            try:
+                key = bound_keys.get(call)
+            except TypeError:
+                # arguments we cannot key on, e.g. arrays, are built every time
+                signature.bind(*args, **kwargs)
+                return build()
+            if key is None:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                key = (name, _normalize(tuple(bound.arguments.items())))
+                if len(bound_keys) >= _MAX_BOUND_KEYS:
+                    bound_keys.clear()
+                bound_keys[call] = key
+            return _theme_cache.get(key, build)
+
+        wrapper.theme_name = name
+        return wrapper
+
+    return decorator
+
+
+def set_theme_overrides(name, params):
+    """Merge ``params`` over the style of theme ``name`` from now on
+    Parameters
+    ----------
+    name : str
+        The theme name, as passed to ``compiled_theme``
+    params : dict or None
+        The rcParams to override, or None to remove the overrides
+    """
+    if params:
+        _overrides[name] = dict(params)
+    else:
+        _overrides.pop(name, None)
+    _theme_cache.discard(name)
+
+
+def theme_cache_info():
+    """Return hits, misses, maxsize and current size of the compiled-theme cache"""
+    return _theme_cache.info()
+
+
+def clear_theme_cache():
+    """Empty the compiled-theme cache"""
+    _theme_cache.clear()
+
+
+def set_theme_cache_size(maxsize):
+    """Set how many compiled themes are kept before evicting the least recently used"""
+    _theme_cache.resize(maxsize)
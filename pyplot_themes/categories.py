@@ -0,0 +1,217 @@
+"""Give every category the same color in every chart.
+
+With a color cycle, the color of "EMEA" depends on how many series were
+plotted before it. A ``CategoryColors`` instead derives each category's
+palette color from a stable hash of the category, so the same category gets
+the same color in every process, whatever order categories are seen in.
+When a category hashes to a color another category already has, it moves to
+the next free color. Those moves, and categories pinned explicitly, depend
+on what was seen before, so the assignments can be saved to a JSON file that
+other processes load and add to. Whole arrays of categories are mapped to
+RGBA at once.
+"""
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+from matplotlib.colors import to_rgba
+
+import pyplot_themes.files as files
+from pyplot_themes.series import _palette_colors, _palette_rgba
+
+
+def _json_key(category):
+    # NumPy scalars, e.g. from np.unique, become plain Python values
+    return category.item() if isinstance(category, np.generic) else category
+
+
+def _stable_hash(category):
+    """Hash a category the same way in every process, unlike ``hash`` of a str"""
+    text = json.dumps(_json_key(category), sort_keys=True, default=str)
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+
+
+class CategoryColors:
+    """Assign palette colors to categories from a stable hash of each category
+    A category whose hashed color is taken gets the next free one. Once every
+    palette color is taken, categories share colors by hash.
+    Parameters
+    ----------
+    palette : list, array, class or cycler, None
+        The colors to use, defaults to the color cycle of the active theme.
+        Colors that are not strings are stored as hex strings.
+    categories : list, None
+        Categories to pin to the palette colors in order, instead of by hash
+    na_color : color, lightgray
+        The color of missing values, i.e. ``None``, NaN or code -1 of a
+        pandas Categorical
+    Examples
+    --------
+    >>> regions = CategoryColors(palettes.Colorblind, ["EMEA", "APAC"])
+    >>> regions["EMEA"]
+    '#000000'
+    >>> ax.scatter(df.x, df.y, c=regions.map(df.region))
+    >>> regions.save("regions.json")
+    """
+
+    def __init__(self, palette=None, categories=None, na_color="lightgray"):
+        self.palette = _palette_colors(palette)
+        self.na_color = na_color
+        self._rgba = _palette_rgba(self.palette)
+        self._indices = {}
+        self._used = set()
+        self._lock = threading.Lock()
+        self._pin((category, index) for index, category in enumerate(categories or ()))
+
+    def __repr__(self):
+        return f"CategoryColors({len(self._indices)} categories, {len(self.palette)} colors)"
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __contains__(self, category):
+        return category in self._indices
+
+    def index(self, category):
+        """Return the palette position of ``category``, assigning one if it is new"""
+        index = self._indices.get(category)
+        if index is None:
+            with self._lock:
+                index = self._indices.get(category)
+                if index is None:
+                    index = self._assign(category)
+        return index
+
+    def _assign(self, category):
+        size = len(self.palette)
+        index = _stable_hash(category) % size
+        if len(self._used) < size:
+            while index in self._used:
+                index = (index + 1) % size
+        self._indices[category] = index
+        self._used.add(index)
+        return index
+
+    def pin(self, category, index):
+        """Give ``category`` the palette color at ``index``, replacing its assignment"""
+        self._pin([(category, index)])
+
+    def _pin(self, assignments):
+        with self._lock:
+            for category, index in assignments:
+                self._indices[category] = index % len(self.palette)
+            self._used = set(self._indices.values())
+
+    def __getitem__(self, category):
+        """Return the palette color of ``category``"""
+        return self.palette[self.index(category)]
+
+    def color(self, category):
+        """Return the palette color of ``category``, see ``__getitem__``"""
+        return self[category]
+
+    @property
+    def table(self):
+        """The categories mapped to their palette positions, in the order they were assigned"""
+        return dict(self._indices)
+
+    def _rgba_for(self, positions):
+        """Look up RGBA rows for palette positions, -1 meaning missing"""
+        colors = self._rgba[np.maximum(positions, 0)]
+        missing = positions < 0
+        if missing.any():
+            colors[missing] = to_rgba(self.na_color)
+        return colors
+
+    def _indices_for(self, uniques):
+        """Return palette positions for unique values, in first-seen order, -1 for missing"""
+        positions = np.empty(len(uniques), dtype=np.intp)
+        for i, category in enumerate(uniques):
+            if category is None or (isinstance(category, float) and category != category):
+                positions[i] = -1
+            else:
+                positions[i] = self.index(_json_key(category))
+        return positions
+
+    def map(self, values):
+        """Return an N x 4 RGBA array with the color of every value
+        Each distinct value is looked up once, so large arrays cost one
+        ``np.unique`` pass and a gather.
+        Parameters
+        ----------
+        values : array-like
+            A NumPy array or list of categories, or a pandas Categorical or
+            categorical Series
+        """
+        # pandas Series of dtype category, then Categorical itself
+        values = getattr(values, "cat", values)
+        if hasattr(values, "codes") and hasattr(values, "categories"):
+            codes = np.asarray(values.codes)
+            present, first = np.unique(codes[codes >= 0], return_index=True)
+            # keep first-seen order, so results do not depend on the category order
+            order = present[np.argsort(first, kind="stable")]
+            lookup = np.full(len(values.categories) + 1, -1, dtype=np.intp)
+            lookup[order] = self._indices_for(np.asarray(values.categories)[order])
+            return self._rgba_for(lookup[codes])
+
+        values = np.asarray(values)
+        try:
+            uniques, first, inverse = np.unique(values, return_index=True, return_inverse=True)
+        except TypeError:
+            # mixed types, e.g. strings and None, that cannot be sorted
+            uniques = list(dict.fromkeys(values.tolist()))
+            first = np.arange(len(uniques))
+            positions = {category: i for i, category in enumerate(uniques)}
+            inverse = np.array([positions[v] for v in values.tolist()], dtype=np.intp)
+            uniques = np.array(uniques, dtype=object)
+        order = np.argsort(first, kind="stable")
+        positions = np.empty(len(uniques), dtype=np.intp)
+        positions[order] = self._indices_for(uniques[order])
+        return self._rgba_for(positions[inverse.reshape(-1)])
+
+    def save(self, path):
+        """Write the palette and the category assignments to a JSON file
+        Assignments already in the file for the same palette are kept, and
+        adopted by this object, so workers that find new categories add to
+        one table instead of overwriting each other. A category only this
+        object knows moves to the next free color if the file gave its color
+        to another category. The file is replaced atomically.
+        """
+        existing = files.read_json(path) if os.path.exists(path) else None
+        if existing and tuple(existing.get("palette", ())) == self.palette:
+            saved = dict(_assignments(existing))
+            with self._lock:
+                # categories only seen here move off colors the file already gave out
+                moved = [category for category, index in self._indices.items()
+                         if category not in saved and index in saved.values()]
+                for category in moved:
+                    del self._indices[category]
+                self._indices.update(saved)
+                self._used = set(self._indices.values())
+                for category in moved:
+                    self._assign(category)
+        data = {
+            "palette": list(self.palette),
+            "na_color": self.na_color,
+            "assignments": [[_json_key(category), index] for category, index in self.table.items()],
+        }
+        files.write_json(path, data, indent=1)
+
+    @classmethod
+    def load(cls, path):
+        """Read assignments written by ``save``"""
+        with open(path) as f:
+            data = json.load(f)
+        colors = cls(data["palette"], na_color=data.get("na_color", "lightgray"))
+        colors._pin(_assignments(data))
+        return colors
+
+
+def _assignments(data):
+    """Return ``(category, index)`` pairs of a saved table"""
+    if "assignments" in data:
+        return [(category, index) for category, index in data["assignments"]]
+    # tables saved as a list of categories in the order they were assigned
+    return [(category, index) for index, category in enumerate(data.get("categories", ()))]
@@ -0,0 +1,125 @@
+"""Matplotlib colormaps built from the ``Sequential`` and ``Diverging`` palettes.
+
+The fixed stops of each palette are linearly interpolated into a lookup table
+of ``lut_size`` colors in one vectorized step, and the resulting colormaps are
+cached. Nothing is registered with matplotlib until ``register_colormaps`` is
+called, which the themes using these colormaps do for you.
+
+Registered names are ``sequential_<name>`` and ``diverging_<name>``, e.g.
+``sequential_blues`` or ``diverging_bluered``, plus ``rocket``. Each one also
+has a reversed ``_r`` version.
+"""
+import copy
+import functools
+
+import matplotlib as mpl
+from matplotlib.colors import ListedColormap
+
+import pyplot_themes.colorspace as colorspace
+import pyplot_themes.palettes as palettes
+
+
+DEFAULT_LUT_SIZE = 256
+
+_registered = {}
+
+
+def _palette_sources():
+    sources = {"rocket": palettes.Rocket.colors}
+    for group in (palettes.Sequential, palettes.Diverging):
+        prefix = group.__name__.lower()
+        for name, value in vars(group).items():
+            if isinstance(value, palettes.Palette):
+                sources[f"{prefix}_{name}"] = value
+    return sources
+
+
+def colormap_names():
+    """Return the names of every colormap this module provides, without ``_r`` versions"""
+    return list(_palette_sources())
+
+
+@functools.lru_cache(maxsize=None)
+def _lookup_table(stops, lut_size):
+    lut = colorspace.interpolate(palettes.Palette(stops).rgba, lut_size)
+    lut.setflags(write=False)
+    return lut
+
+
+def get_colormap(name, lut_size=DEFAULT_LUT_SIZE):
+    """Return a new copy of one of the colormaps built from the palettes
+    Like ``matplotlib.colormaps[name]``, every call returns its own copy, so
+    ``set_bad`` or ``set_under`` on it do not affect other callers.
+    Parameters
+    ----------
+    name : str
+        The colormap name, e.g. ``"rocket"`` or ``"sequential_blues_r"``
+    lut_size : int, 256
+        The number of colors in the lookup table
+    """
+    return copy.copy(_colormap(name, lut_size))
+
+
+@functools.lru_cache(maxsize=None)
+def _colormap(name, lut_size):
+    """The shared, cached colormap, never handed to callers"""
+    base, reverse = (name[:-2], True) if name.endswith("_r") else (name, False)
+    sources = _palette_sources()
+    if base not in sources:
+        raise ValueError(
+            f"Colormap {name!r} is not available, choose one of: {', '.join(sources)}"
+        )
+    cmap = ListedColormap(_lookup_table(tuple(sources[base]), lut_size), name=base)
+    return cmap.reversed(name) if reverse else cmap
+
+
+def _register(cmap, name):
+    registry = getattr(mpl, "colormaps", None)
+    if registry is None:  # matplotlib < 3.5
+        import matplotlib.cm as cm
+
+        cm.register_cmap(name=name, cmap=cmap)
+        return
+    if name in registry and hasattr(registry, "unregister"):
+        # unregistering first avoids the warning about overwriting
+        registry.unregister(name)
+    registry.register(cmap, name=name, force=True)
+
+
+def _is_registered(name):
+    registry = getattr(mpl, "colormaps", None)
+    if registry is not None:
+        return name in registry
+    import matplotlib.cm as cm
+
+    return name in cm.cmap_d
+
+
+def register_colormaps(lut_size=DEFAULT_LUT_SIZE, force=False):
+    """Register the palette colormaps with matplotlib so they work as ``cmap=``
+    Calling this again with the same ``lut_size`` does nothing. A colormap
+    that already exists under the same name, like seaborn's "rocket", is left
+    alone unless ``force`` is True.
+    Parameters
+    ----------
+    lut_size : int, 256
+        The number of colors in each lookup table
+    force : bool, False
+        Replace colormaps already registered under the same name
+    Returns
+    -------
+    list
+        The names of the colormaps that were registered by this call
+    """
+    registered = []
+    for base in _palette_sources():
+        for name in (base, f"{base}_r"):
+            if not force and (_registered.get(name) == lut_size or (
+                name not in _registered and _is_registered(name)
+            )):
+                continue
+            # matplotlib registers a copy, so the cached colormap stays untouched
+            _register(_colormap(name, lut_size), name)
+            _registered[name] = lut_size
+            registered.append(name)
+    return registered
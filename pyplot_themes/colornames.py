@@ -0,0 +1,242 @@
+"""Lookup of named colors from XKCD, CSS4 and the UC Berkeley palette.
+
+The index is built once, on first use, and shared by every lookup.
+Names are matched case- and whitespace-insensitively, so ``"Light Gray"``,
+``"lightgray"`` and ``" light  gray "`` all resolve, and unknown names come
+back with "did you mean" suggestions. ``nearest_color_names`` goes the
+other way, from colors to the closest names in a perceptual color space.
+"""
+import bisect
+import functools
+from types import MappingProxyType
+
+import matplotlib.colors as colors
+import numpy as np
+
+import pyplot_themes.palettes as palettes
+
+
+_XKCD_PREFIX = "xkcd:"
+
+
+def _normalize(name):
+    """Lower case a color name, collapse whitespace and use plain apostrophes"""
+    return " ".join(name.replace("’", "'").lower().split())
+
+
+def _compact(name):
+    """A normalized name with spaces removed, so "light gray" matches "lightgray" """
+    return name.replace(" ", "")
+
+
+def _ngrams(name, n=3):
+    padded = f" {name} "
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+class _ColorIndex:
+    def __init__(self):
+        xkcd = {k[len(_XKCD_PREFIX):]: v for k, v in colors.XKCD_COLORS.items()}
+        css4 = dict(colors.CSS4_COLORS)
+        berkeley = {d["name"]: d["hex_value"] for d in palettes.UCBerkeley.info}
+
+        # later sources win: Berkeley names override CSS4, which override XKCD
+        self.available = MappingProxyType({**xkcd, **css4, **berkeley})
+
+        # lookups prefer CSS4, then XKCD, then Berkeley, so insert in reverse
+        self.lookup = {}
+        self.compact = {}
+        self.display_names = {}
+        for source in (berkeley, xkcd, css4):
+            for name, hex_value in source.items():
+                key = _normalize(name)
+                self.lookup[key] = hex_value
+                self.compact[_compact(key)] = hex_value
+                self.display_names[key] = name
+        for name, hex_value in xkcd.items():
+            self.lookup[_XKCD_PREFIX + _normalize(name)] = hex_value
+
+        self.sorted_names = sorted(self.display_names)
+        self.ngrams = {}
+        for key in self.sorted_names:
+            for gram in _ngrams(key):
+                self.ngrams.setdefault(gram, []).append(key)
+
+    def suggest(self, name, n):
+        key = _normalize(name)
+        if key.startswith(_XKCD_PREFIX):
+            key = key[len(_XKCD_PREFIX):]
+        suggestions = []
+        # names starting with what was typed come first
+        start = bisect.bisect_left(self.sorted_names, key)
+        for candidate in self.sorted_names[start:]:
+            if not candidate.startswith(key) or len(suggestions) >= n:
+                break
+            suggestions.append(candidate)
+        # then rank by the share of trigrams in common
+        grams = _ngrams(key)
+        shared = {}
+        for gram in grams:
+            for candidate in self.ngrams.get(gram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+        scored = sorted(
+            shared.items(),
+            key=lambda item: (-item[1] / (len(grams) + len(_ngrams(item[0])) - item[1]), item[0]),
+        )
+        for candidate, _ in scored:
+            if len(suggestions) >= n:
+                break
+            if candidate not in suggestions:
+                suggestions.append(candidate)
+        return [self.display_names[s] for s in suggestions]
+
+
+@functools.lru_cache(maxsize=None)
+def _index():
+    return _ColorIndex()
+
+
+class _NearestIndex:
+    """Every available color in one perceptual space, with a KD-tree if SciPy is installed"""
+
+    # queries compared at once without SciPy, bounding the distance matrix to about 35 MB
+    chunk_size = 4096
+
+    def __init__(self, space):
+        import pyplot_themes.colorspace as colorspace
+
+        available = _index().available
+        self.space = space
+        self.names = np.array(list(available), dtype=object)
+        self.points = colorspace.from_rgb(colorspace.hex_to_rgb(available.values()), space)
+        self.squared_norms = (self.points ** 2).sum(axis=1)
+        try:
+            from scipy.spatial import cKDTree
+        except ImportError:
+            self.tree = None
+        else:
+            self.tree = cKDTree(self.points)
+
+    def query(self, points, k):
+        if self.tree is not None:
+            distances, indices = self.tree.query(points, k=k)
+            return distances.reshape(len(points), k), indices.reshape(len(points), k)
+        distances = np.empty((len(points), k))
+        indices = np.empty((len(points), k), dtype=np.intp)
+        for start in range(0, len(points), self.chunk_size):
+            chunk = points[start:start + self.chunk_size]
+            # |a - b|^2 = |a|^2 + |b|^2 - 2 a.b, one matrix product instead of a 3-D difference
+            squared = (
+                (chunk ** 2).sum(axis=1)[:, np.newaxis]
+                + self.squared_norms[np.newaxis]
+                - 2 * chunk @ self.points.T
+            )
+            np.maximum(squared, 0, out=squared)
+            nearest = np.argpartition(squared, k - 1, axis=1)[:, :k]
+            nearest_squared = np.take_along_axis(squared, nearest, axis=1)
+            order = np.argsort(nearest_squared, axis=1, kind="stable")
+            indices[start:start + len(chunk)] = np.take_along_axis(nearest, order, axis=1)
+            distances[start:start + len(chunk)] = np.sqrt(
+                np.take_along_axis(nearest_squared, order, axis=1)
+            )
+        return distances, indices
+
+
+@functools.lru_cache(maxsize=None)
+def _nearest_index(space):
+    return _NearestIndex(space)
+
+
+def list_available_colors():
+    """Return a read-only dict of all available colors by name and hex value.
+    Note that some colors have multiple definitions because... reasons.
+    """
+    return _index().available
+
+
+def suggest_colors(color, n=5):
+    """Return up to ``n`` available color names that look like ``color``
+    Parameters
+    ----------
+    color : str
+        A color name, possibly misspelled
+    n : int, 5
+        The maximum number of suggestions
+    """
+    return _index().suggest(color, n)
+
+
+def find_color_hex_value(color="black"):
+    """Helper function to retrieve color hex value by name
+    Parameters
+    ----------
+    color : str, black
+        The name of the color you find the hex value of, useful for
+        building new color palettes. Case and extra whitespace are ignored,
+        and ``xkcd:`` prefixed names always resolve to the XKCD color.
+    """
+    index = _index()
+    hex_value = index.lookup.get(color)
+    if hex_value is None:
+        key = _normalize(color)
+        hex_value = index.lookup.get(key)
+        if hex_value is None:
+            hex_value = index.compact.get(_compact(key))
+    if hex_value is None:
+        suggestions = index.suggest(color, 5)
+        hint = f" Did you mean: {', '.join(suggestions)}?" if suggestions else ""
+        raise ValueError(f"The color {color!r} was not found in available colors.{hint}")
+    return hex_value
+
+
+def find_color_hex_values(color_names):
+    """Retrieve the hex values of many color names at once
+    Parameters
+    ----------
+    color_names : list or iterable
+        The names of the colors, see ``find_color_hex_value``
+    """
+    return [find_color_hex_value(color) for color in color_names]
+
+
+def nearest_color_names(color_values, k=1, space="cielab"):
+    """Return the ``k`` available color names closest to each color
+    Distances are Euclidean in ``space``, so in the default CIELAB they are
+    Delta E 1976, where about 2.3 is a just noticeable difference. The index
+    is built once per space, as a KD-tree when SciPy is installed.
+    Parameters
+    ----------
+    color_values : str, list or array
+        A color, a list of colors such as hex strings, or an N x 3 array of
+        RGB values from 0 to 1
+    k : int, 1
+        The number of names to return per color, closest first
+    space : str, cielab
+        The color space to measure distance in, one of cielab, oklab or rgb
+    Returns
+    -------
+    names, distances
+        Arrays of shape ``(N, k)``, or ``(k,)`` if a single color was given
+    Examples
+    --------
+    >>> names, delta_e = nearest_color_names(["#1f77b4", "#ff7f0e"], k=2)
+    """
+    import pyplot_themes.colorspace as colorspace
+
+    colorspace._check_space(space)
+    if k < 1:
+        raise ValueError(f"k must be at least 1, not {k}")
+    single = isinstance(color_values, str)
+    if single:
+        color_values = [color_values]
+    if isinstance(color_values, np.ndarray) and color_values.dtype.kind == "f":
+        rgb = color_values.reshape(-1, color_values.shape[-1])[:, :3]
+    else:
+        rgb = colorspace.hex_to_rgb(color_values)
+    index = _nearest_index(space)
+    k = min(k, len(index.names))
+    distances, indices = index.query(colorspace.from_rgb(rgb, space), k)
+    names = index.names[indices]
+    if single:
+        return names[0], distances[0]
+    return names, distances
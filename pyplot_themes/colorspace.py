@@ -0,0 +1,139 @@
+"""Batched color space conversions with NumPy.
+
+Every function works on arrays of shape ``(..., 3)`` so whole palettes, or
+whole images, are converted in one call. RGB values are sRGB in ``[0, 1]``.
+CIELAB uses the D65 white point.
+"""
+import numpy as np
+from matplotlib.colors import to_rgba_array
+
+
+SPACES = ("oklab", "cielab", "rgb")
+
+_RGB_TO_XYZ = np.array(
+    [
+        [0.4124564, 0.3575761, 0.1804375],
+        [0.2126729, 0.7151522, 0.0721750],
+        [0.0193339, 0.1191920, 0.9503041],
+    ]
+)
+_XYZ_TO_RGB = np.linalg.inv(_RGB_TO_XYZ)
+_D65_WHITE = np.array([0.95047, 1.0, 1.08883])
+
+_RGB_TO_LMS = np.array(
+    [
+        [0.4122214708, 0.5363325363, 0.0514459929],
+        [0.2119034982, 0.6806995451, 0.1073969566],
+        [0.0883024619, 0.2817188376, 0.6299787005],
+    ]
+)
+_LMS_TO_OKLAB = np.array(
+    [
+        [0.2104542553, 0.7936177850, -0.0040720468],
+        [1.9779984951, -2.4285922050, 0.4505937099],
+        [0.0259040371, 0.7827717662, -0.8086757660],
+    ]
+)
+_LMS_TO_RGB = np.linalg.inv(_RGB_TO_LMS)
+_OKLAB_TO_LMS = np.linalg.inv(_LMS_TO_OKLAB)
+
+
+def hex_to_rgb(hex_values):
+    """Return an N x 3 float array for a list of colors, e.g. hex strings"""
+    return to_rgba_array(list(hex_values))[:, :3]
+
+
+def rgb_to_hex(rgb):
+    """Return a list of ``#rrggbb`` strings for an N x 3 float array"""
+    rgb8 = np.round(np.clip(np.asarray(rgb, dtype=float), 0, 1) * 255).astype(np.uint8)
+    return ["#{:02x}{:02x}{:02x}".format(*row) for row in rgb8.reshape(-1, 3)]
+
+
+def srgb_to_linear(rgb):
+    rgb = np.asarray(rgb, dtype=float)
+    return np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+
+
+def linear_to_srgb(linear):
+    linear = np.clip(np.asarray(linear, dtype=float), 0, None)
+    return np.where(linear <= 0.0031308, linear * 12.92, 1.055 * linear ** (1 / 2.4) - 0.055)
+
+
+def rgb_to_oklab(rgb):
+    lms = srgb_to_linear(rgb) @ _RGB_TO_LMS.T
+    return np.cbrt(lms) @ _LMS_TO_OKLAB.T
+
+
+def oklab_to_rgb(lab):
+    lms = (np.asarray(lab, dtype=float) @ _OKLAB_TO_LMS.T) ** 3
+    return np.clip(linear_to_srgb(lms @ _LMS_TO_RGB.T), 0, 1)
+
+
+def _lab_f(t):
+    delta = 6 / 29
+    return np.where(t > delta ** 3, np.cbrt(t), t / (3 * delta ** 2) + 4 / 29)
+
+
+def _lab_f_inverse(t):
+    delta = 6 / 29
+    return np.where(t > delta, t ** 3, 3 * delta ** 2 * (t - 4 / 29))
+
+
+def rgb_to_cielab(rgb):
+    xyz = srgb_to_linear(rgb) @ _RGB_TO_XYZ.T / _D65_WHITE
+    f = _lab_f(xyz)
+    return np.stack(
+        [116 * f[..., 1] - 16, 500 * (f[..., 0] - f[..., 1]), 200 * (f[..., 1] - f[..., 2])],
+        axis=-1,
+    )
+
+
+def cielab_to_rgb(lab):
+    lab = np.asarray(lab, dtype=float)
+    fy = (lab[..., 0] + 16) / 116
+    f = np.stack([fy + lab[..., 1] / 500, fy, fy - lab[..., 2] / 200], axis=-1)
+    xyz = _lab_f_inverse(f) * _D65_WHITE
+    return np.clip(linear_to_srgb(xyz @ _XYZ_TO_RGB.T), 0, 1)
+
+
+def _check_space(space):
+    if space not in SPACES:
+        raise ValueError(f"Color space must be one of {', '.join(SPACES)}, not {space!r}")
+
+
+def from_rgb(rgb, space="oklab"):
+    """Convert sRGB values to ``space``, one of oklab, cielab or rgb"""
+    _check_space(space)
+    if space == "oklab":
+        return rgb_to_oklab(rgb)
+    if space == "cielab":
+        return rgb_to_cielab(rgb)
+    return np.asarray(rgb, dtype=float)
+
+
+def to_rgb(values, space="oklab"):
+    """Convert values in ``space``, one of oklab, cielab or rgb, back to sRGB"""
+    _check_space(space)
+    if space == "oklab":
+        return oklab_to_rgb(values)
+    if space == "cielab":
+        return cielab_to_rgb(values)
+    return np.clip(np.asarray(values, dtype=float), 0, 1)
+
+
+def interpolate(stops, n):
+    """Linearly interpolate ``n`` evenly spaced values between the rows of ``stops``
+    Parameters
+    ----------
+    stops : array
+        An array of shape ``(k, channels)``, the first and last rows are kept
+    n : int
+        The number of rows to return
+    """
+    stops = np.asarray(stops, dtype=float)
+    if len(stops) == 1:
+        return np.repeat(stops, n, axis=0)
+    position = np.linspace(0, len(stops) - 1, n)
+    lower = np.minimum(position.astype(int), len(stops) - 2)
+    weight = (position - lower)[:, np.newaxis]
+    return stops[lower] * (1 - weight) + stops[lower + 1] * weight
@@ -0,0 +1,178 @@
+"""Build a palette from the colors of an image, such as a logo or screenshot.
+
+JPEG images are decoded at reduced size with DCT scaling and ``.npy`` arrays
+are memory-mapped with only every n-th row and column read, so memory stays
+bounded for very large files of those kinds. Other formats, such as PNG, are
+fully decoded before they are shrunk to the pixel budget, and a warning is
+given when that decode is far larger than the budget. Pixels are binned to 15-bit colors, and the bins, weighted
+by pixel count, are clustered with k-means++ in OKLab, where distances
+follow perceived color differences.
+"""
+import os
+import warnings
+
+import numpy as np
+
+import pyplot_themes.colorspace as colorspace
+import pyplot_themes.palettes as palettes
+
+
+ORDERS = ("prominence", "distinctness")
+
+DEFAULT_MAX_PIXELS = 250_000
+
+# images still this many times over max_pixels after draft() are decoded whole
+FULL_DECODE_WARNING = 16
+
+
+def _read_pixels(image, max_pixels):
+    """Return an N x 3 uint8 array of at most about ``max_pixels`` opaque pixels"""
+    if isinstance(image, (str, os.PathLike)) and str(image).lower().endswith(".npy"):
+        image = np.load(image, mmap_mode="r")
+    if isinstance(image, np.ndarray):
+        step = max(1, int(np.ceil(np.sqrt(image.shape[0] * image.shape[1] / max_pixels))))
+        array = np.asarray(image[::step, ::step])
+        if array.dtype != np.uint8:
+            array = np.round(np.clip(array, 0, 1) * 255).astype(np.uint8)
+    else:
+        try:
+            from PIL import Image
+        except ImportError:
+            raise ImportError(
+                "Reading image files needs Pillow, install it with "
+                "pip install pyplot-themes[image], or pass a NumPy array or .npy file"
+            ) from None
+
+        with Image.open(image) as img:
+            factor = max(1, int(np.ceil(np.sqrt(img.width * img.height / max_pixels))))
+            # JPEG can decode straight to 1/2, 1/4 or 1/8 scale
+            img.draft("RGB", (img.width // factor, img.height // factor))
+            factor = max(1, int(np.ceil(np.sqrt(img.width * img.height / max_pixels))))
+            if img.width * img.height > FULL_DECODE_WARNING * max_pixels:
+                warnings.warn(
+                    f"Decoding all {img.width} x {img.height} pixels of a {img.format} image, "
+                    f"downscale it or save it as JPEG or .npy to bound memory",
+                    stacklevel=3,
+                )
+            if img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGBA" if "transparency" in img.info or "A" in img.mode else "RGB")
+            if factor > 1:
+                img = img.reduce(factor)
+            array = np.asarray(img)
+    if array.ndim == 2:
+        array = np.repeat(array[..., np.newaxis], 3, axis=-1)
+    pixels = array.reshape(-1, array.shape[-1])
+    if pixels.shape[1] == 4:
+        # transparent pixels are background, not part of the palette
+        pixels = pixels[pixels[:, 3] >= 128]
+    return pixels[:, :3]
+
+
+def _color_bins(pixels):
+    """Bin pixels to 5 bits per channel, returning mean RGB of each used bin and its count"""
+    pixels = pixels.astype(np.intp)
+    keys = (pixels[:, 0] >> 3) << 10 | (pixels[:, 1] >> 3) << 5 | (pixels[:, 2] >> 3)
+    counts = np.bincount(keys, minlength=1 << 15)
+    used = np.flatnonzero(counts)
+    rgb = np.stack(
+        [np.bincount(keys, weights=pixels[:, c], minlength=1 << 15)[used] for c in range(3)],
+        axis=1,
+    )
+    return rgb / counts[used][:, np.newaxis] / 255.0, counts[used].astype(float)
+
+
+def _squared_distances(points, centers):
+    return np.maximum(
+        (points ** 2).sum(axis=1)[:, np.newaxis]
+        + (centers ** 2).sum(axis=1)[np.newaxis]
+        - 2 * points @ centers.T,
+        0,
+    )
+
+
+def _kmeans(points, weights, n, iterations, rng):
+    """Weighted k-means with k-means++ seeding, returning centers and their weights"""
+    centers = np.empty((n, points.shape[1]))
+    centers[0] = points[rng.choice(len(points), p=weights / weights.sum())]
+    closest = _squared_distances(points, centers[:1])[:, 0]
+    for i in range(1, n):
+        chance = weights * closest
+        total = chance.sum()
+        index = rng.choice(len(points), p=chance / total) if total > 0 else rng.integers(len(points))
+        centers[i] = points[index]
+        np.minimum(closest, _squared_distances(points, centers[i:i + 1])[:, 0], out=closest)
+
+    for _ in range(iterations):
+        labels = _squared_distances(points, centers).argmin(axis=1)
+        mass = np.bincount(labels, weights=weights, minlength=n)
+        moved = np.stack(
+            [np.bincount(labels, weights=weights * points[:, c], minlength=n) for c in range(3)],
+            axis=1,
+        )
+        empty = mass == 0
+        moved[~empty] /= mass[~empty][:, np.newaxis]
+        # an empty cluster restarts at the point worst served by the others
+        for i in np.flatnonzero(empty):
+            moved[i] = points[_squared_distances(points, moved).min(axis=1).argmax()]
+        converged = np.allclose(moved, centers, atol=1e-5)
+        centers = moved
+        if converged:
+            break
+    labels = _squared_distances(points, centers).argmin(axis=1)
+    return centers, np.bincount(labels, weights=weights, minlength=n)
+
+
+def _order(centers, mass, order):
+    """Return cluster indices by weight, or most distinct next after the heaviest"""
+    by_mass = np.argsort(-mass, kind="stable")
+    if order == "prominence":
+        return by_mass
+    chosen = [by_mass[0]]
+    closest = _squared_distances(centers, centers[chosen])[:, 0]
+    while len(chosen) < len(centers):
+        closest[chosen] = -1
+        chosen.append(int(closest.argmax()))
+        np.minimum(closest, _squared_distances(centers, centers[chosen[-1:]])[:, 0], out=closest)
+    return np.array(chosen)
+
+
+def palette_from_image(image, n=6, order="prominence", max_pixels=DEFAULT_MAX_PIXELS,
+                       iterations=25, seed=0):
+    """Return the ``n`` main colors of an image as a palette
+    Parameters
+    ----------
+    image : str or array
+        An image file Pillow can read, a ``.npy`` file, or an H x W x 3 or
+        H x W x 4 array of uint8 or 0 to 1 floats. Transparent pixels are ignored.
+        Files other than JPEG and ``.npy`` are decoded at full size first.
+    n : int, 6
+        The number of colors
+    order : str, prominence
+        ``prominence`` puts the colors covering the most pixels first,
+        ``distinctness`` starts with the most prominent color and then adds the
+        color farthest from those already picked
+    max_pixels : int, 250000
+        The image is downsampled to about this many pixels before clustering
+    iterations : int, 25
+        The maximum number of k-means iterations
+    seed : int, 0
+        Seeds k-means++, so the same image gives the same palette
+    Returns
+    -------
+    Palette
+        Hex colors, e.g. for ``theme_minimal(palette=...)`` or ``create_palette``
+    Examples
+    --------
+    >>> theme_minimal(palette=palette_from_image("logo.png", n=5, order="distinctness"))
+    """
+    if order not in ORDERS:
+        raise ValueError(f"Order must be one of {', '.join(ORDERS)}, not {order!r}")
+    pixels = _read_pixels(image, max_pixels)
+    if len(pixels) == 0:
+        raise ValueError("The image has no opaque pixels")
+    rgb, counts = _color_bins(pixels)
+    points = colorspace.rgb_to_oklab(rgb)
+    n = min(n, len(points))
+    centers, mass = _kmeans(points, counts, n, iterations, np.random.default_rng(seed))
+    ordered = _order(centers, mass, order)
+    return palettes.Palette(colorspace.rgb_to_hex(colorspace.oklab_to_rgb(centers[ordered])))
@@ -0,0 +1,324 @@
+"""Apply a compiled theme to Figure and Axes objects instead of rcParams.
+
+Themes normally work by changing ``matplotlib.rcParams``, which is global to
+the process. The functions here set the same colors, spines, grid, ticks,
+fonts and color cycle directly on a figure and its axes, so differently
+themed figures can be built and rendered at the same time from several
+threads. Only rcParams are read, never written.
+
+Settings that matplotlib only looks up when an artist is created, such as
+``patch.edgecolor`` or ``image.cmap``, cannot be set on a figure. Call
+``apply_style`` after plotting to theme everything that already exists.
+"""
+from collections.abc import Mapping
+
+import matplotlib as mpl
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import Collection
+from matplotlib.figure import Figure
+from matplotlib.colors import same_color, to_rgba_array
+from matplotlib.font_manager import font_scalings
+from matplotlib.lines import Line2D
+from matplotlib.patches import Patch
+
+from pyplot_themes import fonts, themes
+
+
+def _get(style, key):
+    """Return the style value, or the current rcParams value when the theme does not set it"""
+    return style[key] if key in style else mpl.rcParams[key]
+
+
+def _font_size(value, base):
+    if isinstance(value, str):
+        return base * font_scalings.get(value, 1.0)
+    return value
+
+
+def font_family(style):
+    """Return the concrete font stack of a style, expanding generic families
+    like ``sans-serif`` with the theme's own ``font.sans-serif`` list, so it
+    does not depend on the global rcParams. Families that are not installed
+    are left out, as matplotlib looks up every family of a list on each draw.
+    """
+    family = _get(style, "font.family")
+    if isinstance(family, str):
+        family = [family]
+    installed = fonts._installed_families()
+    resolved = []
+    for name in family:
+        stack = style.get(f"font.{name.lower()}")
+        if isinstance(stack, list):
+            # the generic family stays when none of the theme's fonts is installed
+            resolved.extend([font for font in stack if font.lower() in installed] or [name])
+        else:
+            resolved.append(name)
+    return fonts.resolve_font_stack(resolved, installed)
+
+
+def _style_text(text, color=None, family=None, size=None):
+    if color is not None:
+        text.set_color(color)
+    if family is not None:
+        text.set_fontfamily(family)
+    if size is not None:
+        text.set_fontsize(size)
+
+
+def _tick_params(style, axis, family, base_size):
+    params = {}
+    for key, param in (("color", "colors"), ("direction", "direction")):
+        if f"{axis}tick.{key}" in style:
+            params[param] = style[f"{axis}tick.{key}"]
+    labelcolor = style.get(f"{axis}tick.labelcolor", "inherit")
+    if labelcolor != "inherit":
+        params["labelcolor"] = labelcolor
+    sides = ("bottom", "top") if axis == "x" else ("left", "right")
+    for side in sides:
+        if f"{axis}tick.{side}" in style:
+            params[side] = style[f"{axis}tick.{side}"]
+    if base_size is not None:
+        params["labelsize"] = _font_size(_get(style, f"{axis}tick.labelsize"), base_size)
+    if family is not None:
+        params["labelfontfamily"] = family
+    return params
+
+
+def apply_to_axes(ax, style):
+    """Set the theme's colors, spines, grid, ticks, fonts and color cycle on one Axes
+    Parameters
+    ----------
+    ax : matplotlib.axes.Axes
+        The axes to theme
+    style : dict
+        A compiled theme, e.g. from ``compile_theme``
+    """
+    family = font_family(style) if "font.family" in style else None
+    base_size = style.get("font.size")
+
+    if "axes.facecolor" in style:
+        ax.set_facecolor(style["axes.facecolor"])
+    if "axes.axisbelow" in style:
+        ax.set_axisbelow(style["axes.axisbelow"])
+    if "axes.prop_cycle" in style:
+        ax.set_prop_cycle(style["axes.prop_cycle"])
+
+    for side, spine in ax.spines.items():
+        if f"axes.spines.{side}" in style:
+            spine.set_visible(style[f"axes.spines.{side}"])
+        if "axes.edgecolor" in style:
+            spine.set_edgecolor(style["axes.edgecolor"])
+        if "axes.linewidth" in style:
+            spine.set_linewidth(style["axes.linewidth"])
+
+    if "axes.grid" in style:
+        which = _get(style, "axes.grid.which")
+        axis = _get(style, "axes.grid.axis")
+        if style["axes.grid"]:
+            props = {
+                prop: style[f"grid.{prop}"]
+                for prop in ("color", "linestyle", "linewidth", "alpha")
+                if f"grid.{prop}" in style
+            }
+            ax.grid(False, which="both", axis="both")
+            ax.grid(True, which=which, axis=axis, **props)
+        else:
+            ax.grid(False, which="both", axis="both")
+
+    for axis in ("x", "y"):
+        params = _tick_params(style, axis, family, base_size)
+        if params:
+            try:
+                ax.tick_params(axis=axis, which="both", **params)
+            except ValueError:
+                # labelfontfamily needs matplotlib 3.8
+                params.pop("labelfontfamily", None)
+                ax.tick_params(axis=axis, which="both", **params)
+
+    label_color = style.get("axes.labelcolor")
+    label_size = _font_size(_get(style, "axes.labelsize"), base_size) if base_size else None
+    for label in (ax.xaxis.label, ax.yaxis.label):
+        _style_text(label, label_color, family, label_size)
+
+    title_color = _get(style, "axes.titlecolor")
+    if title_color == "auto":
+        title_color = style.get("text.color")
+    title_size = _font_size(_get(style, "axes.titlesize"), base_size) if base_size else None
+    _style_text(ax.title, title_color, family, title_size)
+
+    legend = ax.get_legend()
+    if legend is not None:
+        for text in legend.get_texts():
+            _style_text(text, style.get("text.color"), family)
+
+
+def apply_style(fig, style):
+    """Theme an existing figure and all of its axes without touching rcParams
+    Parameters
+    ----------
+    fig : matplotlib.figure.Figure
+        The figure to theme
+    style : dict
+        A compiled theme, e.g. from ``compile_theme``
+    """
+    if "figure.facecolor" in style:
+        fig.set_facecolor(style["figure.facecolor"])
+    if "figure.edgecolor" in style:
+        fig.set_edgecolor(style["figure.edgecolor"])
+    family = font_family(style) if "font.family" in style else None
+    for text in fig.texts:
+        _style_text(text, style.get("text.color"), family)
+    for ax in fig.axes:
+        apply_to_axes(ax, style)
+    # remembered so retheme knows which colors came from this theme
+    fig._pyplot_themes_style = style
+    return fig
+
+
+def new_figure(style, nrows=1, ncols=1, **kwargs):
+    """Create a themed Figure with an Agg canvas and a grid of themed Axes
+    The figure is not registered with pyplot, so it is safe to build and
+    render in any thread.
+    Parameters
+    ----------
+    style : dict
+        A compiled theme, e.g. from ``compile_theme``
+    nrows, ncols : int, 1
+        The number of rows and columns of axes
+    **kwargs
+        Passed to ``Figure.subplots``, e.g. ``sharex=True``
+    Returns
+    -------
+    fig, axes
+        Like ``plt.subplots``, a single Axes or an array of them
+    """
+    figure_kw = {
+        name: style[key]
+        for name, key in (
+            ("figsize", "figure.figsize"),
+            ("dpi", "figure.dpi"),
+            ("facecolor", "figure.facecolor"),
+            ("edgecolor", "figure.edgecolor"),
+        )
+        if key in style
+    }
+    fig = Figure(**figure_kw)
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(nrows, ncols, **kwargs)
+    apply_style(fig, style)
+    return fig, axes
+
+
+def _cycle_colors(style):
+    cycle = _get(style, "axes.prop_cycle")
+    return cycle.by_key().get("color", [])
+
+
+def _remap(rgba, old_rgb, new_rgb):
+    """Replace the rows of an N x 4 array matching an old color, keeping alpha
+    Returns the rows that changed.
+    """
+    if len(rgba) == 0 or len(old_rgb) == 0:
+        return np.zeros(len(rgba), dtype=bool)
+    matches = np.all(np.abs(rgba[:, np.newaxis, :3] - old_rgb[np.newaxis]) < 1e-6, axis=-1)
+    hit = matches.any(axis=1)
+    rgba[hit, :3] = new_rgb[matches[hit].argmax(axis=1)]
+    return hit
+
+
+def _remap_artists(artists, getter, setter, old_rgb, new_rgb):
+    """Remap one color property of many single-color artists in one NumPy pass"""
+    if not artists:
+        return
+    rgba = to_rgba_array([getattr(artist, getter)() for artist in artists])
+    for i in np.flatnonzero(_remap(rgba, old_rgb, new_rgb)):
+        getattr(artists[i], setter)(tuple(rgba[i].tolist()))
+
+
+def _theme_style(theme, args, kwargs):
+    if isinstance(theme, Mapping):
+        return theme
+    if isinstance(theme, themes.Theme):
+        return theme.style
+    return themes.compile_theme(theme, *args, **kwargs)
+
+
+def retheme(fig, theme, *args, previous=None, **kwargs):
+    """Switch an existing figure to another theme without plotting it again
+    Colors, spines, grid, ticks and text are updated in place like
+    ``apply_style``. Lines, patches and collections drawn with the n-th color
+    of the previous theme's color cycle get the n-th color of the new one,
+    wrapping around if the new cycle is shorter. Colormapped collections and
+    colors that were not taken from the cycle are left alone.
+    Parameters
+    ----------
+    fig : matplotlib.figure.Figure
+        The figure to theme
+    theme : str, function, Theme or dict
+        The theme name, e.g. ``"dark"``, a ``theme_*`` function, a ``Theme``
+        or a compiled theme
+    *args, **kwargs
+        The arguments of the theme, e.g. ``scheme="light"``
+    previous : dict, None
+        The compiled theme the figure was drawn with. Defaults to the last
+        theme applied to the figure by this module, or else the current
+        rcParams.
+    Examples
+    --------
+    >>> retheme(fig, "dark")
+    >>> retheme(fig, "solarized", scheme="light")
+    """
+    style = _theme_style(theme, args, kwargs)
+    if previous is None:
+        previous = getattr(fig, "_pyplot_themes_style", None) or mpl.rcParams
+
+    old_colors = _cycle_colors(previous)
+    new_colors = _cycle_colors(style) if "axes.prop_cycle" in style else old_colors
+    if old_colors and new_colors:
+        old_rgb = to_rgba_array(old_colors)[:, :3]
+        new_rgb = to_rgba_array([new_colors[i % len(new_colors)] for i in range(len(old_colors))])[:, :3]
+    else:
+        old_rgb = new_rgb = np.zeros((0, 3))
+
+    old_text = _get(previous, "text.color")
+    new_text = style.get("text.color")
+    for ax in fig.axes:
+        legend = ax.get_legend()
+        handles = []
+        if legend is not None:
+            handles = list(getattr(legend, "legend_handles", None) or legend.legendHandles)
+        artists = ax.get_children() + handles
+
+        lines = [a for a in artists if isinstance(a, Line2D)]
+        # marker colors usually follow the line color, only remap those set on their own
+        if lines:
+            line_rgba = to_rgba_array([line.get_color() for line in lines])
+            for prop in ("markerfacecolor", "markeredgecolor"):
+                marker_rgba = to_rgba_array([getattr(line, f"get_{prop}")() for line in lines])
+                own = np.any(marker_rgba != line_rgba, axis=1)
+                markers = [line for line, is_own in zip(lines, own) if is_own]
+                _remap_artists(markers, f"get_{prop}", f"set_{prop}", old_rgb, new_rgb)
+        _remap_artists(lines, "get_color", "set_color", old_rgb, new_rgb)
+
+        patches = [
+            a for a in artists
+            if isinstance(a, Patch) and a is not ax.patch and a not in ax.spines.values()
+        ]
+        _remap_artists(patches, "get_facecolor", "set_facecolor", old_rgb, new_rgb)
+        _remap_artists(patches, "get_edgecolor", "set_edgecolor", old_rgb, new_rgb)
+
+        for collection in (a for a in artists if isinstance(a, Collection)):
+            if collection.get_array() is not None:
+                continue
+            for getter, setter in (("get_facecolor", "set_facecolor"), ("get_edgecolor", "set_edgecolor")):
+                rgba = np.array(getattr(collection, getter)(), dtype=float).reshape(-1, 4)
+                if _remap(rgba, old_rgb, new_rgb).any():
+                    getattr(collection, setter)(rgba)
+
+        if new_text is not None:
+            for text in ax.texts:
+                if same_color(text.get_color(), old_text):
+                    text.set_color(new_text)
+
+    return apply_style(fig, style)
@@ -0,0 +1,41 @@
+"""Small files shared between processes, e.g. resolved fonts and category colors."""
+import json
+import os
+import tempfile
+
+
+def read_json(path, default=None):
+    """Return the JSON data in ``path``, or ``default`` if it is missing or unreadable"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def write_json(path, data, **kwargs):
+    """Write ``data`` to ``path`` as JSON, atomically
+    The data goes to a temporary file in the same directory that is then renamed,
+    so concurrent readers never see a partial file. The temporary file is
+    removed if writing fails.
+    Parameters
+    ----------
+    path : str
+        The file to write
+    data : object
+        Anything ``json.dump`` accepts
+    **kwargs
+        Passed to ``json.dump``, e.g. ``indent=1``
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, **kwargs)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,134 @@
+"""Resolve theme font stacks to the fonts that are actually installed.
+
+Themes ask for fonts such as Arial or Open Sans that are often missing on
+servers, so the first text drawn makes ``font_manager.findfont`` fail, warn
+and fall back. ``warm_fonts`` rewrites a theme's font stacks to the installed
+families once, primes ``findfont``, and stores the result in a small JSON
+file in the matplotlib cache directory, keyed by theme and by the set of
+fonts the font manager knows about, so fresh processes can reuse it.
+"""
+import hashlib
+import os
+
+import matplotlib as mpl
+from matplotlib import font_manager
+
+import pyplot_themes.cache as cache
+import pyplot_themes.files as files
+from pyplot_themes import registry, themes
+
+
+FONT_KEYS = (
+    "font.family",
+    "font.sans-serif",
+    "font.serif",
+    "font.monospace",
+    "font.cursive",
+    "font.fantasy",
+)
+
+GENERIC_FAMILIES = {"serif", "sans-serif", "sans serif", "sans", "monospace", "cursive", "fantasy"}
+
+CACHE_VERSION = 1
+
+
+def default_cache_path():
+    """Where resolved font stacks are stored, inside the matplotlib cache directory"""
+    return os.path.join(mpl.get_cachedir(), "pyplot_themes-fonts.json")
+
+
+def _installed_families():
+    # afm fonts are only used by the PDF/PS core font options, not for drawing
+    return {font.name.lower() for font in font_manager.fontManager.ttflist}
+
+
+def font_manager_state():
+    """Return a short fingerprint of the fonts matplotlib knows about"""
+    families = sorted(_installed_families())
+    digest = hashlib.sha1("\n".join([mpl.__version__] + families).encode()).hexdigest()
+    return digest[:16]
+
+
+def resolve_font_stack(stack, installed=None):
+    """Drop the families of a font stack that are not installed
+    Generic families, like ``sans-serif``, are always kept. If nothing in the
+    stack is left, the stack is returned unchanged.
+    Parameters
+    ----------
+    stack : str or list
+        A font family name or a list of them, as used in ``font.*`` rcParams
+    installed : set, None
+        Lower case names of the installed families, looked up if not given
+    """
+    if isinstance(stack, str):
+        stack = [stack]
+    if installed is None:
+        installed = _installed_families()
+    resolved = [
+        family for family in stack
+        if family.lower() in GENERIC_FAMILIES or family.lower() in installed
+    ]
+    return resolved or list(stack)
+
+
+def _load(path):
+    data = files.read_json(path, {})
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        return {}
+    return data
+
+
+def _save(path, data):
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        files.write_json(path, data, indent=1, sort_keys=True)
+    except OSError:
+        pass
+
+
+def _prime_findfont(stacks):
+    """Look up the fonts the theme draws with, so findfont has them cached"""
+    for family in stacks.get("font.family", []):
+        stack = stacks.get(f"font.{family.lower()}", [family])
+        concrete = [f for f in stack if f.lower() not in GENERIC_FAMILIES]
+        if concrete:
+            font_manager.findfont(font_manager.FontProperties(family=concrete))
+
+
+def warm_fonts(theme, cache_path=None):
+    """Resolve a theme's font stacks to installed fonts and use them from now on
+    Later calls of the theme, in this process, use the resolved stacks. The
+    result is stored in ``cache_path`` so other processes skip resolving.
+    Parameters
+    ----------
+    theme : str or function
+        The theme name, e.g. ``"ucberkeley"``, or the ``theme_*`` function
+    cache_path : str, None
+        The JSON file to store resolved stacks in, see ``default_cache_path``
+    Returns
+    -------
+    dict
+        The resolved ``font.*`` rcParams of the theme
+    """
+    name = registry.get_theme(theme).theme_name
+    path = cache_path or default_cache_path()
+    state = font_manager_state()
+
+    data = _load(path)
+    stored = data.get("states", {}).get(state, {})
+    if name in stored:
+        stacks = stored[name]
+    else:
+        cache.set_theme_overrides(name, None)
+        style = themes.compile_theme(name)
+        installed = _installed_families()
+        stacks = {
+            key: resolve_font_stack(style[key], installed) for key in FONT_KEYS if key in style
+        }
+        # only the current font manager state is worth keeping
+        data = {"version": CACHE_VERSION, "states": {state: dict(stored, **{name: stacks})}}
+        _save(path, data)
+
+    cache.set_theme_overrides(name, stacks)
+    _prime_findfont(stacks)
+    return stacks
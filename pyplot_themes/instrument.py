@@ -0,0 +1,131 @@
+"""Opt-in timing and change tracking of theme application.
+
+Once ``enable`` is called, every ``rcmod.set_style`` and ``rcmod.reset_style``
+is timed and the rcParams it changed are counted, per theme. The time spent
+compiling themes, which includes building their layers in
+``rcmod.theme_style`` and validating them, is summed too. Compiled themes are
+cached, so a theme is only compiled the first time it is used with given
+arguments. Callbacks can be registered for the ``before_apply`` and
+``after_apply`` events.
+
+While disabled, which is the default, the only cost is one flag check per
+call, so instrumentation can stay in production code.
+"""
+import threading
+import time
+from collections import namedtuple
+
+
+EVENTS = ("before_apply", "after_apply")
+
+StageStats = namedtuple("StageStats", ["calls", "seconds"])
+ThemeStats = namedtuple("ThemeStats", ["calls", "seconds", "changed"])
+
+enabled = False
+
+_lock = threading.Lock()
+_hooks = {event: [] for event in EVENTS}
+_stages = {}
+_themes = {}
+
+
+def enable(reset=False):
+    """Start recording stats and calling hooks
+    Parameters
+    ----------
+    reset : bool, False
+        Drop the stats recorded so far
+    """
+    global enabled
+    if reset:
+        reset_stats()
+    enabled = True
+
+
+def disable():
+    """Stop recording stats and calling hooks, keeping the stats recorded so far"""
+    global enabled
+    enabled = False
+
+
+def add_hook(event, callback):
+    """Call ``callback`` on every ``event`` while instrumentation is enabled
+    Parameters
+    ----------
+    event : str
+        ``before_apply``, called as ``callback(name, style)`` before rcParams
+        are written, or ``after_apply``, called as
+        ``callback(name, changed, seconds)`` with the set of changed rcParams.
+        ``name`` is the theme name, or None for a plain dict of rcParams.
+    callback : callable
+        Exceptions it raises propagate to the caller applying the theme
+    """
+    if event not in EVENTS:
+        raise ValueError(f"Event must be one of {', '.join(EVENTS)}, not {event!r}")
+    with _lock:
+        _hooks[event] = _hooks[event] + [callback]
+
+
+def remove_hook(event, callback):
+    """Stop calling a callback added with ``add_hook``"""
+    with _lock:
+        hooks = list(_hooks.get(event, ()))
+        hooks.remove(callback)
+        _hooks[event] = hooks
+
+
+def stats():
+    """Return the stats recorded while enabled
+    Returns
+    -------
+    dict
+        ``compile``, ``theme_style`` and ``set_style`` map to a ``StageStats``
+        with the number of calls and the seconds spent. ``compile`` covers
+        cache misses of compiled themes, including their ``theme_style`` time.
+        ``themes`` maps each theme name, or None for plain dicts, to a
+        ``ThemeStats`` with its number of applies, the seconds spent applying
+        it, and how often each rcParam was changed.
+    """
+    with _lock:
+        return {
+            "compile": StageStats(*_stages.get("compile", (0, 0.0))),
+            "theme_style": StageStats(*_stages.get("theme_style", (0, 0.0))),
+            "set_style": StageStats(*_stages.get("set_style", (0, 0.0))),
+            "themes": {
+                name: ThemeStats(calls, seconds, dict(changed))
+                for name, (calls, seconds, changed) in _themes.items()
+            },
+        }
+
+
+def reset_stats():
+    """Drop the stats recorded so far, keeping the hooks"""
+    with _lock:
+        _stages.clear()
+        _themes.clear()
+
+
+def record(stage, seconds):
+    """Add one call taking ``seconds`` to the totals of ``stage``"""
+    with _lock:
+        calls, total = _stages.get(stage, (0, 0.0))
+        _stages[stage] = (calls + 1, total + seconds)
+
+
+def observe_apply(apply, style, delta):
+    """Call ``apply(style, delta)`` with hooks around it and record its stats"""
+    name = getattr(style, "name", None)
+    for callback in _hooks["before_apply"]:
+        callback(name, style)
+    start = time.perf_counter()
+    changed = apply(style, delta)
+    seconds = time.perf_counter() - start
+    record("set_style", seconds)
+    with _lock:
+        calls, total, counts = _themes.get(name, (0, 0.0, {}))
+        for key in changed:
+            counts[key] = counts.get(key, 0) + 1
+        _themes[name] = (calls + 1, total + seconds, counts)
+    for callback in _hooks["after_apply"]:
+        callback(name, changed, seconds)
+    return changed
@@ -0,0 +1,94 @@
+"""Themes declared as stacked layers of rcParams.
+
+A theme is a base style with more specific layers on top, e.g. the minimal
+base, then a palette, grid and tick settings, then a caller's overrides.
+``ThemeLayers`` keeps references to the layers instead of merging them into
+a copy, looks keys up through a ``ChainMap``, and merges them only once,
+when the whole style is needed, remembering the result. ``rcmod.set_style``
+never needs it, it writes the layers one by one, so a compiled base keeps
+its validated fast path. Adding a layer returns a new ``ThemeLayers``
+sharing the layers below it, and no layer is ever written to, so a shared
+base cannot be changed by accident.
+"""
+from collections import ChainMap
+from collections.abc import Mapping
+from types import MappingProxyType
+
+
+class ThemeLayers(Mapping):
+    """An immutable stack of rcParams layers, later layers winning
+    Parameters
+    ----------
+    *layers : dict
+        The layers from the most general to the most specific. ``None``
+        layers are skipped.
+    Examples
+    --------
+    >>> base = ThemeLayers.from_theme("few", scheme="dark")
+    >>> tenant = base.override({"axes.facecolor": "#fafafa"})
+    >>> pyplot_themes.rcmod.set_style(tenant)
+    """
+
+    __slots__ = ("_layers", "_chain", "_flat")
+
+    def __init__(self, *layers):
+        flattened = []
+        for layer in layers:
+            if isinstance(layer, ThemeLayers):
+                flattened.extend(layer._layers)
+            elif layer:
+                flattened.append(MappingProxyType(layer) if isinstance(layer, dict) else layer)
+        self._layers = tuple(flattened)
+        self._chain = ChainMap(*reversed(self._layers))
+        self._flat = None
+
+    @classmethod
+    def from_theme(cls, name, *args, **kwargs):
+        """Start from the compiled style of a registered theme
+        Parameters
+        ----------
+        name : str or function
+            The name of the theme, e.g. ``"few"``
+        *args, **kwargs
+            The arguments of the theme, e.g. ``scheme="dark"``
+        """
+        from pyplot_themes.registry import get_theme
+
+        return cls(get_theme(name)(*args, **kwargs))
+
+    @property
+    def layers(self):
+        """The read-only layers, from the most general to the most specific"""
+        return self._layers
+
+    def override(self, *params):
+        """Return new layers with ``params`` on top, sharing the current layers"""
+        return ThemeLayers(self, *params)
+
+    def flatten(self):
+        """Return the merged style as a read-only mapping, computed once"""
+        if self._flat is None:
+            self._flat = MappingProxyType(dict(self._chain))
+        return self._flat
+
+    def __getitem__(self, key):
+        if self._flat is not None:
+            return self._flat[key]
+        return self._chain[key]
+
+    def __contains__(self, key):
+        if self._flat is not None:
+            return key in self._flat
+        return key in self._chain
+
+    def __iter__(self):
+        return iter(self.flatten())
+
+    def __len__(self):
+        return len(self.flatten())
+
+    def items(self):
+        return self.flatten().items()
+
+    def __repr__(self):
+        return f"ThemeLayers({len(self._layers)} layers, {len(self)} rcParams)"
@@ -1,3 +1,68 @@
+import functools
+
+
+class Palette(list):
+    """A list of hex color values that also caches them as RGBA arrays.
+
+    A ``Palette`` behaves exactly like the list of hex strings it wraps, so it
+    can be passed anywhere a list of colors is accepted. The parsed colors are
+    computed once, on first access of ``rgba``, and reused until the list is
+    modified, so artists and colormaps built from it skip re-parsing strings.
+    """
+
+    def __getitem__(self, index):
+        value = super().__getitem__(index)
+        if isinstance(index, slice):
+            return Palette(value)
+        return value
+
+    def __add__(self, other):
+        return Palette(super().__add__(other))
+
+    def __mul__(self, n):
+        return Palette(super().__mul__(n))
+
+    __rmul__ = __mul__
+
+    def _cached(self, name, build):
+        key = tuple(self)
+        cached = self.__dict__.get(name)
+        if cached is None or cached[0] != key:
+            value = build()
+            value.setflags(write=False)
+            cached = self.__dict__[name] = (key, value)
+        return cached[1]
+
+    @property
+    def rgba(self):
+        """A read-only N x 4 float array of the colors, with values from 0 to 1"""
+        from matplotlib.colors import to_rgba_array
+
+        return self._cached("_rgba", lambda: to_rgba_array(list(self)))
+
+    @property
+    def rgba_uint8(self):
+        """A read-only N x 4 uint8 array of the colors, with values from 0 to 255"""
+        import numpy as np
+
+        return self._cached("_rgba_uint8", lambda: np.round(self.rgba * 255).astype(np.uint8))
+
+    def to_colormap(self, name="palette", N=None):
+        """Build a ``matplotlib.colors.ListedColormap`` from the cached RGBA array
+        Parameters
+        ----------
+        name : str, palette
+            The name of the colormap
+        N : int, None
+            The number of colors in the colormap, defaults to the palette length
+        """
+        from matplotlib.colors import ListedColormap
+
+        if N is None or N == len(self):
+            return ListedColormap(self.rgba, name=name)
+        return ListedColormap(self.rgba[[i % len(self) for i in range(N)]], name=name)
+
+
 class Colorblind:
     info = {
         "Black": "#000000",
@@ -9,11 +74,11 @@ class Colorblind:
         "Vermillion": "#D55E00",
         "Reddish Purple": "#CC79A7",
     }
-    colors = list(info.values())
+    colors = Palette(info.values())
 
 
 class Solarized:
-    dark = [
+    dark = Palette([
         "#002b36",
         "#073642",
         "#586e75",
@@ -22,12 +87,12 @@ class Solarized:
         "#93a1a1",
         "#eee8d5",
         "#fdf6e3",
-    ]
+    ])
     light = dark[::-1]
 
 
 class PaulTolColorSchemes:
-    colors = [
+    colors = Palette([
         "#332288",
         "#6699CC",
         "#88CCEE",
@@ -40,11 +105,11 @@ class PaulTolColorSchemes:
         "#AA4466",
         "#882255",
         "#AA4499",
-    ]
+    ])
 
 
 class Few:
-    light = [
+    light = Palette([
         "#8C8C8C",
         "#88BDE6",
         "#FBB258",
@@ -54,8 +119,8 @@ class Few:
         "#BC99C7",
         "#EDDD46",
         "#F07E6E",
-    ]
-    medium = [
+    ])
+    medium = Palette([
         "#4D4D4D",
         "#5DA5DA",
         "#FAA43A",
@@ -65,8 +130,8 @@ class Few:
         "#B276B2",
         "#DECF3F",
         "#F15854",
-    ]
-    dark = [
+    ])
+    dark = Palette([
         "#000000",
         "#265DAB",
         "#DF5C24",
@@ -76,11 +141,11 @@ class Few:
         "#7B3A96",
         "#C7B42E",
         "#CB2027",
-    ]
+    ])
 
 
 class FiveThirtyEight:
-    colors = ["#008fd5", "#fc4f30", "#e5ae38", "#6d904f", "#8b8b8b", "#810f7c"]
+    colors = Palette(["#008fd5", "#fc4f30", "#e5ae38", "#6d904f", "#8b8b8b", "#810f7c"])
 
 
 class UCBerkeley:
@@ -104,44 +169,69 @@ class UCBerkeley:
         {"hex_value": "#859438", "name": "Soybean", "type": "secondary"},
         {"hex_value": "#584F29", "name": "Stone Pine", "type": "secondary"},
     ]
-    colors = [d["hex_value"] for d in info]
-    primary_colors = [d["hex_value"] for d in info if d["type"] == "primary"]
-    secondary_colors = [d["hex_value"] for d in info if d["type"] == "secondary"]
+    colors = Palette(d["hex_value"] for d in info)
+    primary_colors = Palette(d["hex_value"] for d in info if d["type"] == "primary")
+    secondary_colors = Palette(d["hex_value"] for d in info if d["type"] == "secondary")
 
 
 class Autumn1:
     """From https://duoparadigms.com/2013/10/11/10-color-palettes-perfect-autumnfall-season/"""
 
-    colors = ["#D1CEC5", "#997C67", "#755330", "#B0703C", "#DBA72E", "#E3CCA1"]
+    colors = Palette(["#D1CEC5", "#997C67", "#755330", "#B0703C", "#DBA72E", "#E3CCA1"])
 
 
 class Autumn2:
     """From https://duoparadigms.com/2013/10/11/10-color-palettes-perfect-autumnfall-season/"""
 
-    colors = ["#6D7696", "#59484F", "#455C4F", "#CC5543", "#EDB579", "#DBE6AF"]
+    colors = Palette(["#6D7696", "#59484F", "#455C4F", "#CC5543", "#EDB579", "#DBE6AF"])
 
 
 class Canyon:
     """From https://duoparadigms.com/2013/10/11/10-color-palettes-perfect-autumnfall-season/"""
 
-    colors = ["#6E352C", "#CF5230", "#F59A44", "#E3C598", "#8A6E64", "#6E612F"]
+    colors = Palette(["#6E352C", "#CF5230", "#F59A44", "#E3C598", "#8A6E64", "#6E612F"])
 
 
 class Chili:
     """From https://duoparadigms.com/2013/10/11/10-color-palettes-perfect-autumnfall-season/"""
 
-    colors = ["#283811", "#66492F", "#B8997F", "#A68887", "#D94330", "#5C0811"]
+    colors = Palette(["#283811", "#66492F", "#B8997F", "#A68887", "#D94330", "#5C0811"])
 
 
 class Tomato:
     """From https://duoparadigms.com/2013/10/11/10-color-palettes-perfect-autumnfall-season/"""
 
-    colors = ["#D6CFC9", "#C2C290", "#4A572C", "#803018", "#E34819", "#E87F60"]
+    colors = Palette(["#D6CFC9", "#C2C290", "#4A572C", "#803018", "#E34819", "#E87F60"])
+
+
+class Rocket:
+    """Stops sampled evenly from the "rocket" colormap of seaborn, so the colormap
+    is available without seaborn. See ``pyplot_themes.colormaps``."""
+
+    colors = Palette([
+        "#03051a",
+        "#180f29",
+        "#30173a",
+        "#481c48",
+        "#611f53",
+        "#7b1f59",
+        "#971c5b",
+        "#b21758",
+        "#cb1b4f",
+        "#de2e44",
+        "#ec4a3e",
+        "#f26948",
+        "#f4865e",
+        "#f6a178",
+        "#f6bb97",
+        "#f8d3ba",
+        "#faebdd",
+    ])
 
 
 class Sequential:
     """Color gradients based on a single base color"""
-    blues = [
+    blues = Palette([
         "#00008b",
         "#302197",
         "#483ba2",
@@ -151,9 +241,9 @@ class Sequential:
         "#8fa1d0",
         "#9ebcdb",
         "#add8e6",
-    ]
+    ])
 
-    cyans = [
+    cyans = Palette([
         "#002728",
         "#003d43",
         "#00565a",
@@ -163,9 +253,9 @@ class Sequential:
         "#00c3c4",
         "#00e1e1",
         "#00ffff",
-    ]
+    ])
 
-    greens = [
+    greens = Palette([
         "#002100",
         "#003900",
         "#005200",
@@ -175,9 +265,9 @@ class Sequential:
         "#59bd46",
         "#75d860",
         "#91f479",
-    ]
+    ])
 
-    oranges = [
+    oranges = Palette([
         "#ffc54e",
         "#ffa122",
         "#f18100",
@@ -187,9 +277,9 @@ class Sequential:
         "#842600",
         "#6b0a00",
         "#4b0000",
-    ]
+    ])
 
-    purples = [
+    purples = Palette([
         "#47004c",
         "#68006a",
         "#880c87",
@@ -199,9 +289,9 @@ class Sequential:
         "#ec79e7",
         "#fd98fb",
         "#ffc0ff",
-    ]
+    ])
 
-    reds = [
+    reds = Palette([
         "#780000",
         "#940000",
         "#b10000",
@@ -211,13 +301,13 @@ class Sequential:
         "#ff663f",
         "#ff875a",
         "#ffa473",
-    ]
+    ])
 
 
 class Diverging:
     """Color palettes with gradients ranging from one color to another"""
 
-    blueorange = [
+    blueorange = Palette([
         "#00008b",
         "#3220c4",
         "#5f4bde",
@@ -228,11 +318,11 @@ class Diverging:
         "#c25b01",
         "#963200",
         "#670600",
-    ]
+    ])
 
     orangeblue = blueorange[::-1]
 
-    bluepurple = [
+    bluepurple = Palette([
         "#1f0c97",
         "#5335c4",
         "#845bee",
@@ -243,11 +333,11 @@ class Diverging:
         "#be4fbb",
         "#922891",
         "#630065",
-    ]
+    ])
 
     purpleblue = bluepurple[::-1]
 
-    bluered = [
+    bluered = Palette([
         "#00008b",
         "#392a9b",
         "#564baa",
@@ -260,11 +350,11 @@ class Diverging:
         "#d1301f",
         "#b11109",
         "#8b0000",
-    ]
+    ])
 
     redblue = bluered[::-1]
 
-    greenpurple = [
+    greenpurple = Palette([
         "#003b00",
         "#106210",
         "#238c23",
@@ -275,11 +365,11 @@ class Diverging:
         "#be4fbb",
         "#922891",
         "#630065",
-    ]
+    ])
 
     purplegreen = greenpurple[::-1]
 
-    greenred = [
+    greenred = Palette([
         "#003b00",
         "#0d5b0d",
         "#1b7e1c",
@@ -292,6 +382,63 @@ class Diverging:
         "#d1301f",
         "#b11109",
         "#8b0000",
-    ]
+    ])
 
     redgreen = greenred[::-1]
+
+
+@functools.lru_cache(maxsize=1024)
+def _generate_palette(anchors, n, space):
+    import pyplot_themes.colorspace as colorspace
+
+    values = colorspace.from_rgb(colorspace.hex_to_rgb(anchors), space)
+    return tuple(colorspace.rgb_to_hex(colorspace.to_rgb(colorspace.interpolate(values, n), space)))
+
+
+def generate_palette(anchors, n, space="oklab"):
+    """Return ``n`` evenly spaced colors running through the anchor colors
+    Colors are interpolated in a perceptual color space, so the steps look
+    even, and results are memoized per (anchors, n, space).
+    Parameters
+    ----------
+    anchors : list
+        Two or more colors, as hex values or any other matplotlib color
+    n : int
+        The number of colors to return
+    space : str, oklab
+        The color space to interpolate in, one of oklab, cielab or rgb
+    Examples
+    --------
+    >>> generate_palette(["#00008b", "#ffffff", "#8b0000"], 15)
+    """
+    from matplotlib.colors import to_hex
+
+    if n < 1:
+        raise ValueError("n must be a positive integer")
+    if isinstance(anchors, str):
+        anchors = [anchors]
+    key = tuple(to_hex(color) for color in anchors)
+    if not key:
+        raise ValueError("At least one anchor color is needed")
+    return Palette(_generate_palette(key, n, space))
+
+
+def resample_palette(palette, n, space="oklab"):
+    """Stretch or shrink an existing palette to ``n`` colors
+    Parameters
+    ----------
+    palette : list or class
+        A list of colors, or a palette class with a ``colors`` attribute,
+        e.g. ``palettes.Sequential.blues`` or ``palettes.Autumn1``
+    n : int
+        The number of colors to return
+    space : str, oklab
+        The color space to interpolate in, one of oklab, cielab or rgb
+    """
+    if isinstance(palette, type):
+        if not hasattr(palette, "colors"):
+            raise TypeError(
+                f"{palette.__name__} has no colors attribute, pass one of its palettes instead"
+            )
+        palette = palette.colors
+    return generate_palette(palette, n, space)
@@ -1,5 +1,11 @@
+import contextlib
+import time
+from collections.abc import Mapping
 import matplotlib as mpl
+from pyplot_themes import instrument
 from pyplot_themes import themes as themes
+from pyplot_themes.layers import ThemeLayers
+from pyplot_themes.validated import ValidatedStyle
 
 def grid_style(grid=True):
     """toggle grid on/off"""
@@ -31,9 +37,10 @@ def axes_ticks_style(ticks=True):
 
 
 def theme_style(params=None, palette=None, grid=True, ticks=True, figsize=[12.0, 8.0]):
-    """Return a parameter dict for the aesthetic style of the plots.
+    """Return the layered parameters for the aesthetic style of the plots.
     This affects things like the color of the axes, whether a grid is
-    enabled by default, and other aesthetic elements.
+    enabled by default, and other aesthetic elements. ``params`` is used as
+    the base layer and is not modified.
     Parameters
     ----------
     params : dict, None
@@ -46,39 +53,212 @@ def theme_style(params=None, palette=None, grid=True, ticks=True, figsize=[12.0,
         A toggle for whether to use tick marks.
     figsize : list or tupe, [12.0, 8.0]
         The width and height of plots, defaults to 12 by 8.
+    Returns
+    -------
+    ThemeLayers
+        The base, palette, grid, ticks and figsize layers, in that order
     """
-    if isinstance(params, dict):
-        style_dict = params
+    start = time.perf_counter() if instrument.enabled else None
+    if isinstance(params, Mapping):
+        base = params
     else:
-        style_dict = themes._theme_minimal()
+        base = themes._theme_minimal()
 
+    layers = [base]
     if palette is not None:
-        pal_style = {
-            "axes.prop_cycle": themes.create_palette(palette),
-        }
-        style_dict.update(pal_style)
+        layers.append({"axes.prop_cycle": themes.create_palette(palette)})
 
     if grid is not None:
-        grids_params = grid_style(grid=grid)
-        style_dict.update(grids_params)
+        layers.append(grid_style(grid=grid))
 
     if ticks is not None:
-        tick_params = axes_ticks_style(ticks=ticks)
-        style_dict.update(tick_params)
+        layers.append(axes_ticks_style(ticks=ticks))
 
     if figsize is not None:
-        style_dict.update({"figure.figsize": figsize})
+        layers.append({"figure.figsize": figsize})
 
-    return style_dict
+    style = ThemeLayers(*layers)
+    if start is not None:
+        instrument.record("theme_style", time.perf_counter() - start)
+    return style
 
 
-def set_style(style_params):
+# rcParams changed through set_style since the last reset_style
+_modified = set()
+# the key and defaults of the last reset_style, incremental resets need the same
+_reset_to = None
+
+
+def _rc_get(key):
+    """Read an rcParam without triggering backend resolution or deprecation logic"""
+    return dict.__getitem__(mpl.rcParams, key)
+
+
+def _same_value(current, target):
+    try:
+        return bool(current == target)
+    except Exception:
+        # e.g. comparing arrays, treat as changed and let matplotlib validate
+        return False
+
+
+def _raw_setter():
+    # rcParams._set is the supported way to skip validation since matplotlib 3.7
+    setter = getattr(mpl.rcParams, "_set", None)
+    if setter is None:
+        return lambda key, value: dict.__setitem__(mpl.rcParams, key, value)
+    return setter
+
+
+def _set_validated(values, delta=True, skip=()):
+    """Write values matplotlib already validated, skipping the validators"""
+    raw_set = _raw_setter()
+    changed = set()
+    for key, value in values.items():
+        if key in skip:
+            continue
+        if delta and dict.__contains__(mpl.rcParams, key):
+            current = _rc_get(key)
+            if current is value or _same_value(current, value):
+                continue
+        # the style is shared and cached, rcParams must not hold its lists
+        raw_set(key, list(value) if isinstance(value, list) else value)
+        changed.add(key)
+    return changed
+
+
+def _apply(style_params, delta, skip=()):
+    """Write ``style_params`` to rcParams, leaving out the keys in ``skip``"""
+    if isinstance(style_params, ThemeLayers):
+        # walk the layers instead of merging them, so a compiled base keeps its
+        # fast path; each key is written once, from the last layer that sets it
+        changed = set()
+        shadowed = set(skip)
+        layers = style_params.layers
+        for i in range(len(layers) - 1, -1, -1):
+            changed |= _apply(layers[i], delta, shadowed)
+            if i:
+                shadowed.update(layers[i])
+        return changed
+
+    if isinstance(style_params, ValidatedStyle) and style_params.is_current:
+        changed = _set_validated(style_params.validated, delta, skip)
+        if style_params.deferred:
+            changed |= _apply(style_params.deferred, delta, skip)
+        return changed
+
+    if skip:
+        style_params = {key: value for key, value in style_params.items() if key not in skip}
+
+    if not delta:
+        mpl.rcParams.update(style_params)
+        return set(style_params)
+
+    changed = set()
+    for key, value in style_params.items():
+        try:
+            current = _rc_get(key)
+        except KeyError:
+            # unknown or deprecated key, let matplotlib decide what to do
+            mpl.rcParams[key] = value
+            changed.add(key)
+            continue
+        if current is value or _same_value(current, value):
+            continue
+        mpl.rcParams[key] = value
+        # validation may turn the value into what was already set, e.g. 1 -> 1.0
+        if not _same_value(current, _rc_get(key)):
+            changed.add(key)
+    return changed
+
+
+def set_style(style_params, delta=True):
     """Pass a dict of style params to matplotlib
     Paramaters
     ----------
     style_params : dict, style params used to override matplotlib.rcParams
+    delta : bool, True
+        Only validate and write the params whose value differs from the
+        current matplotlib.rcParams. Set to False to push every param.
+        A ``ValidatedStyle`` compiled with the installed matplotlib is
+        written without validating again.
+    Returns
+    -------
+    set
+        The names of the rcParams that were changed.
+    """
+    if instrument.enabled:
+        changed = instrument.observe_apply(_apply, style_params, delta)
+    else:
+        changed = _apply(style_params, delta)
+    _modified.update(changed)
+    return changed
+
+
+def modified_keys():
+    """Return the rcParams ``set_style`` changed since the last ``reset_style``
+    Changes made to matplotlib.rcParams directly, or by ``matplotlib.style.use``,
+    are not tracked.
+    """
+    return frozenset(_modified)
+
+
+def reset_style(defaults, incremental=False, key=None):
+    """Restore matplotlib.rcParams to ``defaults``
+    Parameters
+    ----------
+    defaults : dict
+        The style to restore, e.g. the compiled ``matplotlib_default`` theme
+    incremental : bool, False
+        Only restore the rcParams ``set_style`` changed since the last reset,
+        see ``modified_keys``. Faster, but misses rcParams changed any other way.
+        A full reset is done instead unless the last reset restored the same
+        ``defaults`` under the same ``key``.
+    key : hashable, None
+        Identifies the defaults, e.g. the arguments they were compiled with
+    Returns
+    -------
+    set
+        The names of the rcParams that were changed.
+    """
+    global _reset_to
+    if incremental and _reset_to is not None and _reset_to[0] == key and _reset_to[1] is defaults:
+        keys = _modified.intersection(defaults)
+        if isinstance(defaults, ValidatedStyle):
+            style = defaults.subset(keys)
+        else:
+            style = {name: defaults[name] for name in keys}
+    else:
+        style = defaults
+    if instrument.enabled:
+        changed = instrument.observe_apply(_apply, style, True)
+    else:
+        changed = _apply(style, True)
+    _reset_to = (key, defaults)
+    _modified.clear()
+    return changed
+
+
+@contextlib.contextmanager
+def style_context(style_params):
+    """Temporarily apply a dict of style params to matplotlib.
+    Only the rcParams named in ``style_params`` are saved on entry and
+    restored on exit, instead of copying the whole of matplotlib.rcParams.
+    Parameters
+    ----------
+    style_params : dict, style params used to override matplotlib.rcParams
     """
-    mpl.rcParams.update(style_params)
+    saved = {}
+    for key in style_params:
+        try:
+            saved[key] = _rc_get(key)
+        except KeyError:
+            pass
+    try:
+        set_style(style_params)
+        yield
+    finally:
+        set_style(saved)
 
 
 def dark_settings():
@@ -0,0 +1,146 @@
+"""Look up themes by name, including themes installed by other packages.
+
+Every theme is registered under its name, e.g. ``"few"``, as a builder
+function returning its style dict. Packages can ship more themes by
+declaring an entry point in the ``pyplot_themes.themes`` group, for example
+in ``setup.py``::
+
+    entry_points={
+        "pyplot_themes.themes": ["corporate = corporate_themes:corporate_style"],
+    }
+
+where ``corporate_style(**kwargs)`` returns a dict of rcParams. Entry points
+are only read the first time a name is not found, and only the requested
+theme's module is imported, so installed plugins do not slow down startup.
+"""
+import threading
+
+from pyplot_themes.cache import compiled_theme
+
+
+ENTRY_POINT_GROUP = "pyplot_themes.themes"
+
+_themes = {}
+_entry_points = None
+_lock = threading.Lock()
+
+
+def _canonical_name(name):
+    if callable(name):
+        name = name.__name__
+    if name.startswith("theme_"):
+        name = name[len("theme_"):]
+    return name
+
+
+def register_theme(name, builder=None, aliases=(), replace=False):
+    """Register a theme builder under ``name``
+    Can be used as a decorator. Builders that are not cached yet are wrapped
+    with the compiled theme cache.
+    Parameters
+    ----------
+    name : str
+        The name to look the theme up by, e.g. ``"corporate"``
+    builder : function, None
+        Returns the theme's rcParams dict for the theme's arguments
+    aliases : tuple, ()
+        Other names for the same theme
+    replace : bool, False
+        Replace a theme already registered under one of the names
+    Examples
+    --------
+    >>> @register_theme("corporate")
+    ... def corporate_style(scheme="light"):
+    ...     return {"axes.facecolor": "#ffffff" if scheme == "light" else "#222222"}
+    >>> pyplot_themes.apply("corporate", scheme="dark")
+    """
+    if builder is None:
+        return lambda builder: register_theme(name, builder, aliases, replace)
+    if not hasattr(builder, "theme_name"):
+        builder = compiled_theme(name)(builder)
+    names = (name,) + tuple(aliases)
+    with _lock:
+        taken = [n for n in names if n in _themes and _themes[n] is not builder]
+        if taken and not replace:
+            raise ValueError(f"Theme {taken[0]!r} is already registered, pass replace=True")
+        for n in names:
+            _themes[n] = builder
+    return builder
+
+
+def _installed_entry_points():
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        # Python < 3.8
+        try:
+            from importlib_metadata import entry_points
+        except ImportError:
+            return []
+    found = entry_points()
+    if hasattr(found, "select"):
+        return list(found.select(group=ENTRY_POINT_GROUP))
+    return list(found.get(ENTRY_POINT_GROUP, []))
+
+
+def _discover():
+    """Find the built-in and installed theme names, once, without importing plugins"""
+    global _entry_points
+    # registers the built-in themes
+    import pyplot_themes.themes  # noqa: F401
+
+    with _lock:
+        if _entry_points is None:
+            _entry_points = {ep.name: ep for ep in _installed_entry_points()}
+    return _entry_points
+
+
+def get_theme(name):
+    """Return the cached style builder of a theme
+    Parameters
+    ----------
+    name : str or function
+        The name of the theme, e.g. ``"dark"``, or the ``theme_dark`` function itself
+    """
+    if callable(name) and hasattr(name, "theme_name"):
+        return name
+    name = _canonical_name(name)
+    builder = _themes.get(name)
+    if builder is not None:
+        return builder
+    entry_point = _discover().get(name)
+    if name not in _themes and entry_point is not None:
+        register_theme(name, entry_point.load())
+    if name not in _themes:
+        raise ValueError(
+            f"Theme {name!r} is not available, choose one of: {', '.join(available_themes())}"
+        )
+    return _themes[name]
+
+
+def available_themes():
+    """Return the sorted names of the built-in, registered and installed themes"""
+    installed = _discover()
+    return sorted(set(_themes) | set(installed))
+
+
+def apply(name, *args, **kwargs):
+    """Apply a theme by name, like calling its ``theme_*`` function
+    Parameters
+    ----------
+    name : str or function
+        The name of the theme, e.g. ``"few"``
+    *args, **kwargs
+        The arguments of the theme, e.g. ``scheme="dark"``
+    Returns
+    -------
+    set
+        The names of the rcParams that were changed.
+    Examples
+    --------
+    >>> pyplot_themes.apply("few", scheme="dark")
+    """
+    # rcmod imports the built-in themes, which import this module
+    import pyplot_themes.rcmod as rcmod
+
+    return rcmod.set_style(get_theme(name)(*args, **kwargs))
@@ -0,0 +1,223 @@
+"""Save compiled themes to files and apply them without rebuilding.
+
+A theme called with its arguments can be exported in three formats, picked
+by file extension:
+
+* ``.json``: versioned and human readable, with the theme name and arguments
+* ``.mplstyle``: a plain matplotlib style file, usable with ``plt.style.use``
+* ``.ptheme``: a compact binary file of rcParams values that were already
+  validated by matplotlib, so loading is a single unpickle
+
+Binary files are pickles, only load ones you created or trust. If they were
+written with another matplotlib version their values are validated again.
+"""
+import enum
+import json
+import os
+import pickle
+
+import matplotlib as mpl
+from cycler import Cycler, cycler
+
+import pyplot_themes.colormaps as colormaps
+import pyplot_themes.rcmod as rcmod
+from pyplot_themes import registry
+from pyplot_themes.validated import ValidatedStyle
+
+
+FORMAT_NAME = "pyplot-themes"
+FORMAT_VERSION = 1
+BINARY_MAGIC = b"PTTHEME\x00"
+FORMATS = {".json": "json", ".mplstyle": "mplstyle", ".ptheme": "binary"}
+
+# these depend on the machine, not the theme, and are left out of artifacts
+_SKIPPED_KEYS = {"backend", "backend_fallback", "interactive"}
+
+
+def _format_for(path, format=None):
+    if format is not None:
+        return format
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(
+            f"Cannot tell the theme format of {path!r}, use one of {', '.join(FORMATS)}"
+        )
+    return FORMATS[extension]
+
+
+def _validated(style):
+    """Return a plain dict of the style with every value validated by matplotlib"""
+    validators = mpl.rcParams.validate
+    return {k: validators[k](v) for k, v in style.items() if k not in _SKIPPED_KEYS}
+
+
+def _encode(value):
+    if isinstance(value, Cycler):
+        return {"__cycler__": {k: _encode(v) for k, v in value.by_key().items()}}
+    if isinstance(value, tuple):
+        return {"__tuple__": [_encode(v) for v in value]}
+    if isinstance(value, list):
+        return [_encode(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _encode(v) for k, v in value.items()}
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    raise TypeError(f"Cannot serialize {value!r} of type {type(value).__name__}")
+
+
+def _decode(value):
+    if isinstance(value, dict):
+        if "__cycler__" in value:
+            return cycler(**{k: _decode(v) for k, v in value["__cycler__"].items()})
+        if "__tuple__" in value:
+            return tuple(_decode(v) for v in value["__tuple__"])
+        return {k: _decode(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    return value
+
+
+def _mplstyle_value(value):
+    def color(v):
+        # "#" starts a comment in style files, and matplotlib accepts bare hex
+        return v[1:] if isinstance(v, str) and v.startswith("#") else v
+
+    if isinstance(value, Cycler):
+        props = ", ".join(
+            f"{k}={[color(v) for v in values]!r}" for k, values in value.by_key().items()
+        )
+        return f"cycler({props})"
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(color(v)) for v in value)
+    if isinstance(value, enum.Enum):
+        return value.name
+    return str(color(value))
+
+
+def theme_artifact(theme, *args, **kwargs):
+    """Return the compiled theme as a versioned, validated artifact dict
+    Parameters
+    ----------
+    theme : str or function
+        The theme name, e.g. ``"few"``, or the ``theme_*`` function
+    *args, **kwargs
+        The arguments the ``theme_*`` function accepts, e.g. ``scheme="dark"``
+    """
+    builder = registry.get_theme(theme)
+    return {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "matplotlib": mpl.__version__,
+        "theme": builder.theme_name,
+        "args": list(args),
+        "kwargs": kwargs,
+        "rcparams": _validated(builder(*args, **kwargs)),
+    }
+
+
+def export_theme(path, theme, *args, **kwargs):
+    """Compile a theme with its arguments and write it to ``path``
+    The format comes from the extension: ``.json``, ``.mplstyle`` or ``.ptheme``.
+    Parameters
+    ----------
+    path : str
+        The file to write
+    theme : str or function
+        The theme name, e.g. ``"few"``, or the ``theme_*`` function
+    *args, **kwargs
+        The arguments the ``theme_*`` function accepts, e.g. ``scheme="dark"``
+    Examples
+    --------
+    >>> export_theme("few-dark.ptheme", "few", scheme="dark")
+    >>> apply_theme_file("few-dark.ptheme")
+    """
+    format = _format_for(path)
+    artifact = theme_artifact(theme, *args, **kwargs)
+    if format == "binary":
+        with open(path, "wb") as f:
+            f.write(BINARY_MAGIC)
+            pickle.dump(artifact, f, protocol=pickle.HIGHEST_PROTOCOL)
+    elif format == "json":
+        with open(path, "w") as f:
+            json.dump(_encode(artifact), f, indent=2, sort_keys=True)
+    else:
+        header = (
+            f"## {FORMAT_NAME} theme {artifact['theme']}, format {FORMAT_VERSION}, "
+            f"matplotlib {artifact['matplotlib']}\n"
+        )
+        validators = mpl.rcParams.validate
+        with open(path, "w") as f:
+            f.write(header)
+            for key, value in sorted(artifact["rcparams"].items()):
+                text = _mplstyle_value(value)
+                try:
+                    validators[key](text)
+                except ValueError:
+                    # e.g. savefig.bbox None has no spelling in a style file
+                    f.write(f"## {key} cannot be written in a style file\n")
+                    continue
+                f.write(f"{key}: {text}\n")
+
+
+def _check_artifact(artifact, path):
+    if artifact.get("format") != FORMAT_NAME or artifact.get("version") != FORMAT_VERSION:
+        raise ValueError(f"{path!r} is not a {FORMAT_NAME} theme of format {FORMAT_VERSION}")
+
+
+def _register_colormap(name):
+    """Register this package's colormaps if ``name`` is one of them, e.g. rocket"""
+    if isinstance(name, str):
+        base = name[:-2] if name.endswith("_r") else name
+        if base in colormaps.colormap_names():
+            colormaps.register_colormaps()
+
+
+def _mplstyle_cmap(path):
+    """Return the ``image.cmap`` value of an ``.mplstyle`` file, if it sets one"""
+    with open(path) as f:
+        for line in f:
+            key, _, value = line.split("#", 1)[0].partition(":")
+            if key.strip() == "image.cmap":
+                return value.strip().strip('"')
+    return None
+
+
+def load_theme(path):
+    """Read a theme file written by ``export_theme`` and return its rcParams
+    The result is a ``ValidatedStyle``, so applying it skips validation.
+    Parameters
+    ----------
+    path : str
+        A ``.json``, ``.mplstyle`` or ``.ptheme`` file
+    """
+    format = _format_for(path)
+    if format == "mplstyle":
+        _register_colormap(_mplstyle_cmap(path))
+        # rc_params_from_file already validated every value
+        params = mpl.rc_params_from_file(path, use_default_template=False)
+        return ValidatedStyle({k: dict.__getitem__(params, k) for k in params})
+    if format == "json":
+        with open(path) as f:
+            artifact = _decode(json.load(f))
+        _check_artifact(artifact, path)
+        _register_colormap(artifact["rcparams"].get("image.cmap"))
+        return ValidatedStyle.validate(artifact["rcparams"], artifact["theme"])
+    with open(path, "rb") as f:
+        if f.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+            raise ValueError(f"{path!r} is not a binary {FORMAT_NAME} theme")
+        artifact = pickle.load(f)
+    _check_artifact(artifact, path)
+    _register_colormap(artifact["rcparams"].get("image.cmap"))
+    if artifact["matplotlib"] != mpl.__version__:
+        return ValidatedStyle.validate(artifact["rcparams"], artifact["theme"])
+    return ValidatedStyle(artifact["rcparams"], matplotlib=artifact["matplotlib"], name=artifact["theme"])
+
+
+def apply_theme_file(path):
+    """Apply a theme file written by ``export_theme``
+    Returns
+    -------
+    set
+        The names of the rcParams that were changed.
+    """
+    return rcmod.set_style(load_theme(path))
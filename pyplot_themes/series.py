@@ -0,0 +1,112 @@
+"""Colors for many series at once, as one RGBA array.
+
+Drawing thousands of lines one ``plot`` call at a time is slow. With
+``series_colors`` every series gets its theme color in a single array that
+can be passed straight to a ``LineCollection`` or a ``PathCollection``, so
+the whole plot becomes one artist.
+"""
+from functools import lru_cache
+
+import matplotlib as mpl
+import numpy as np
+from cycler import Cycler
+from matplotlib.colors import to_hex, to_rgba, to_rgba_array
+
+import pyplot_themes.colorspace as colorspace
+
+
+MODES = ("wrap", "shade", "interpolate")
+
+
+@lru_cache(maxsize=64)
+def _palette_rgba(colors):
+    rgba = to_rgba_array(list(colors))
+    rgba.setflags(write=False)
+    return rgba
+
+
+def _hex(color):
+    if isinstance(color, str):
+        return color
+    rgba = to_rgba(color)
+    return to_hex(rgba, keep_alpha=rgba[3] < 1)
+
+
+def _palette_colors(palette):
+    """Return the colors of a palette as a tuple of strings, usable as a cache key"""
+    if palette is None:
+        palette = mpl.rcParams["axes.prop_cycle"]
+    if isinstance(palette, Cycler):
+        palette = palette.by_key().get("color")
+        if not palette:
+            raise ValueError("The color cycle has no colors")
+    elif isinstance(palette, type):
+        if not hasattr(palette, "colors"):
+            raise TypeError(
+                f"{palette.__name__} has no colors attribute, pass one of its palettes instead"
+            )
+        palette = palette.colors
+    # RGB(A) sequences and array rows are not hashable, hex strings are
+    colors = tuple(_hex(color) for color in palette)
+    if not colors:
+        raise ValueError("The palette has no colors")
+    return colors
+
+
+def _shades(rgba, n, step):
+    """Repeat the palette, lighter and darker in turns on every pass"""
+    k = len(rgba)
+    index = np.arange(n)
+    passes = index // k
+    # 0, +1, -1, +2, -2, ... steps of lightness for pass 0, 1, 2, 3, 4, ...
+    offset = np.where(passes % 2 == 1, (passes + 1) // 2, -(passes // 2)) * step
+    lab = colorspace.rgb_to_oklab(rgba[index % k, :3])
+    lab[:, 0] = np.clip(lab[:, 0] + offset, 0, 1)
+    colors = np.empty((n, 4))
+    colors[:, :3] = np.clip(colorspace.oklab_to_rgb(lab), 0, 1)
+    colors[:, 3] = rgba[index % k, 3]
+    return colors
+
+
+def series_colors(n, palette=None, mode="wrap", step=0.12):
+    """Return an ``n`` x 4 RGBA array with one color per series
+    While ``n`` is at most the number of palette colors, the first ``n``
+    colors are used in order, like the color cycle does. Past that, ``mode``
+    picks how to get more colors.
+    Parameters
+    ----------
+    n : int
+        The number of series
+    palette : list, array, class or cycler, None
+        The colors to use, defaults to the color cycle of the active theme.
+        Any matplotlib colors work, e.g. names, hex strings or RGB(A) rows.
+        Palette classes like ``palettes.Colorblind`` use their ``colors``.
+    mode : str, wrap
+        ``wrap`` repeats the palette, ``shade`` repeats it lighter and darker
+        on every pass, ``interpolate`` spreads ``n`` colors evenly through the
+        palette in OKLab
+    step : float, 0.12
+        How much lightness changes per pass in ``shade`` mode, on OKLab's 0 to 1 scale
+    Examples
+    --------
+    >>> from matplotlib.collections import LineCollection
+    >>> segments = [np.column_stack([x, y]) for y in ys]
+    >>> ax.add_collection(LineCollection(segments, colors=series_colors(len(segments))))
+    """
+    if mode not in MODES:
+        raise ValueError(f"Mode must be one of {', '.join(MODES)}, not {mode!r}")
+    if n < 0:
+        raise ValueError(f"The number of series must be zero or more, not {n}")
+    rgba = _palette_rgba(_palette_colors(palette))
+    k = len(rgba)
+    if n <= k:
+        return rgba[:n].copy()
+    if mode == "wrap":
+        return rgba[np.arange(n) % k]
+    if mode == "shade":
+        return _shades(rgba, n, step)
+    colors = np.empty((n, 4))
+    lab = colorspace.interpolate(colorspace.rgb_to_oklab(rgba[:, :3]), n)
+    colors[:, :3] = np.clip(colorspace.oklab_to_rgb(lab), 0, 1)
+    colors[:, 3] = colorspace.interpolate(rgba[:, 3:], n)[:, 0]
+    return colors
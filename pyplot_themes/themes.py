@@ -1,16 +1,20 @@
 import warnings
 from cycler import cycler
+import matplotlib as mpl
 import matplotlib.colors as colors
-import matplotlib.pyplot as plt
+import matplotlib.style as mpl_style
 import pyplot_themes.rcmod as rcmod
+from pyplot_themes.registry import get_theme, register_theme
+import pyplot_themes.colormaps as colormaps
 import pyplot_themes.palettes as palettes
-from matplotlib.cbook.deprecation import MatplotlibDeprecationWarning
+from pyplot_themes.colornames import find_color_hex_value, list_available_colors
 
 
-def theme_matplotlib_default(notebook=True):
+@register_theme("matplotlib_default", aliases=("reset",))
+def _matplotlib_default_style(notebook=True):
     with warnings.catch_warnings():
-        warnings.simplefilter("ignore", MatplotlibDeprecationWarning)
-        default_rcparams = {k: v for k, v in plt.rcParamsDefault.items()}
+        warnings.simplefilter("ignore", mpl.MatplotlibDeprecationWarning)
+        default_rcparams = {k: v for k, v in mpl.rcParamsDefault.items()}
         notebook_settings = {
             "figure.dpi": 72.0,
             "figure.edgecolor": (1, 1, 1, 0),
@@ -21,44 +25,29 @@ def theme_matplotlib_default(notebook=True):
         }
         if notebook:
             default_rcparams.update(notebook_settings)
-        rcmod.set_style(default_rcparams)
+    return default_rcparams
 
 
-# alias
-theme_reset = theme_matplotlib_default
-
-
-def find_color_hex_value(color="black"):
-    """Helper function to retrieve color hex value by name
+def theme_matplotlib_default(notebook=True, incremental=False):
+    """Reset matplotlib to its default settings
+    The defaults are compiled once per process for each ``notebook`` value.
     Parameters
     ----------
-    color : str, black
-        The name of the color you find the hex value of, useful for 
-        building new color palettes. 
+    notebook : bool, True
+        Use the smaller figure size and dpi matplotlib uses in notebooks
+    incremental : bool, False
+        Only restore the rcParams that themes changed since the last reset.
+        Much faster between jobs, but changes made to rcParams directly,
+        e.g. ``plt.rcParams["lines.linewidth"] = 3``, are not undone. The
+        first reset in a process, or one with a different ``notebook``, is
+        always full.
     """
-    # try CSS4 colors
-    hex_value = colors.CSS4_COLORS.get(color)
-    # try xkcd colors
-    if hex_value is None:
-        hex_value = colors.XKCD_COLORS.get(f"xkcd:{color}")
-    if hex_value is None:
-        berkeley = {d["name"]: d["hex_value"] for d in palettes.UCBerkeley.info}
-        hex_value = berkeley.get(color)
-    if hex_value is None:
-        print(f"The Color {color} was not found in available colors.")
-        raise
-    return hex_value
+    notebook = bool(notebook)
+    rcmod.reset_style(_matplotlib_default_style(notebook), incremental, key=notebook)
 
 
-def list_available_colors():
-    """Return a dict of all available colors by name and hex value.
-    Note that some colors have multiple definitions because... reasons.
-    """
-    xkcd = {k.strip("xkcd:"): v for k, v in colors.XKCD_COLORS.items()}
-    css4 = colors.CSS4_COLORS
-    berkeley = {d["name"]: d["hex_value"] for d in palettes.UCBerkeley.info}
-    all_colors = {**xkcd, **css4, **berkeley}
-    return all_colors
+# alias
+theme_reset = theme_matplotlib_default
 
 
 def create_palette(hex_values):
@@ -76,6 +65,8 @@ def create_palette(hex_values):
 
 def _theme_minimal():
     """A decent, minimal theme"""
+    # "image.cmap" below needs rocket, which otherwise only exists with seaborn
+    colormaps.register_colormaps()
     colorblind = [v for v in palettes.Colorblind.colors]
     light_gray = find_color_hex_value("lightgray")
     dark_gray = find_color_hex_value("gray")
@@ -109,31 +100,18 @@ def _theme_minimal():
     return style_dict
 
 
-def theme_minimal(palette=None, grid=True, ticks=True, figsize=None, fontsize=None):
-    """A decent, minimal theme
-    Parameters
-    ----------
-    palette : list, None
-        A list of hex values to pass in as a color palette
-    grid : bool, True
-        Toggle gridlines on/off
-    axes : bool, True
-        Toggle tick marks on/off
-    figsize : list or tuple, None
-        Sets the figsize for plots, for example ``figsize=[9,6]``
-    fontsize : int or float, None
-        Sets the font size for plots, for example ``fontsize=12.5``
-    """
+@register_theme("minimal")
+def _minimal_style(palette=None, grid=True, ticks=True, figsize=None, fontsize=None):
     if figsize is None:
         figsize = [12.0, 8.0]
     style = rcmod.theme_style(None, palette, grid, ticks, figsize)
     if fontsize is not None:
-        style.update({"font.size": fontsize})
-    rcmod.set_style(style)
+        style = style.override({"font.size": fontsize})
+    return style
 
 
-def theme_dark(palette=None, grid=True, ticks=True, figsize=None, fontsize=None):
-    """A decent, minimal dark theme
+def theme_minimal(palette=None, grid=True, ticks=True, figsize=None, fontsize=None):
+    """A decent, minimal theme
     Parameters
     ----------
     palette : list, None
@@ -147,6 +125,11 @@ def theme_dark(palette=None, grid=True, ticks=True, figsize=None, fontsize=None)
     fontsize : int or float, None
         Sets the font size for plots, for example ``fontsize=12.5``
     """
+    rcmod.set_style(_minimal_style(palette, grid, ticks, figsize, fontsize))
+
+
+@register_theme("dark")
+def _dark_style(palette=None, grid=True, ticks=True, figsize=None, fontsize=None):
     if figsize is None:
         figsize = [12.0, 8.0]
     style = rcmod.theme_style(None, palette, grid, ticks, figsize)
@@ -154,16 +137,18 @@ def theme_dark(palette=None, grid=True, ticks=True, figsize=None, fontsize=None)
     if palette is None:
         darkcolorblind = [v for v in palettes.Colorblind.colors][1:]
         dark_style.update({"axes.prop_cycle": create_palette(darkcolorblind)})
-    style.update(dark_style)
+    style = style.override(dark_style)
     if fontsize is not None:
-        style.update({"font.size": fontsize})
-    rcmod.set_style(style)
+        style = style.override({"font.size": fontsize})
+    return style
 
 
-def theme_tableau(grid=True, ticks=True, figsize=None, fontsize=None):
-    """Theme based on the defaults in Tableau
+def theme_dark(palette=None, grid=True, ticks=True, figsize=None, fontsize=None):
+    """A decent, minimal dark theme
     Parameters
     ----------
+    palette : list, None
+        A list of hex values to pass in as a color palette
     grid : bool, True
         Toggle gridlines on/off
     axes : bool, True
@@ -173,21 +158,24 @@ def theme_tableau(grid=True, ticks=True, figsize=None, fontsize=None):
     fontsize : int or float, None
         Sets the font size for plots, for example ``fontsize=12.5``
     """
+    rcmod.set_style(_dark_style(palette, grid, ticks, figsize, fontsize))
+
+
+@register_theme("tableau")
+def _tableau_style(grid=True, ticks=True, figsize=None, fontsize=None):
     if figsize is None:
         figsize = [12.0, 8.0]
     tableau_colors = [v for v in colors.TABLEAU_COLORS.values()]
     style = rcmod.theme_style(None, tableau_colors, grid, ticks, figsize)
     if fontsize is not None:
-        style.update({"font.size": fontsize})
-    rcmod.set_style(style)
+        style = style.override({"font.size": fontsize})
+    return style
 
 
-def theme_solarized(scheme="dark", grid=True, ticks=True, figsize=None, fontsize=None):
+def theme_tableau(grid=True, ticks=True, figsize=None, fontsize=None):
     """Theme based on the defaults in Tableau
     Parameters
     ----------
-    scheme : str, dark or light
-        Use one of dark or light solarized color schemes
     grid : bool, True
         Toggle gridlines on/off
     axes : bool, True
@@ -197,6 +185,11 @@ def theme_solarized(scheme="dark", grid=True, ticks=True, figsize=None, fontsize
     fontsize : int or float, None
         Sets the font size for plots, for example ``fontsize=12.5``
     """
+    rcmod.set_style(_tableau_style(grid, ticks, figsize, fontsize))
+
+
+@register_theme("solarized")
+def _solarized_style(scheme="dark", grid=True, ticks=True, figsize=None, fontsize=None):
     if figsize is None:
         figsize = [12.0, 8.0]
     if scheme == "dark":
@@ -215,7 +208,7 @@ def theme_solarized(scheme="dark", grid=True, ticks=True, figsize=None, fontsize
         print("Scheme must be one of dark or light")
         raise
     style = rcmod.theme_style(None, pal_colors, grid, ticks, figsize)
-    style.update(
+    style = style.override(
         {
             "figure.facecolor": fig_color,
             "axes.facecolor": fig_color,
@@ -223,16 +216,16 @@ def theme_solarized(scheme="dark", grid=True, ticks=True, figsize=None, fontsize
         }
     )
     if fontsize is not None:
-        style.update({"font.size": fontsize})
-    rcmod.set_style(style)
+        style = style.override({"font.size": fontsize})
+    return style
 
 
-def theme_paul_tol(reverse_colors=False, grid=True, ticks=True, figsize=None, fontsize=None):
+def theme_solarized(scheme="dark", grid=True, ticks=True, figsize=None, fontsize=None):
     """Theme based on the defaults in Tableau
     Parameters
     ----------
-    reverse : bool, False
-        Toggle color palette order forward or reverse
+    scheme : str, dark or light
+        Use one of dark or light solarized color schemes
     grid : bool, True
         Toggle gridlines on/off
     axes : bool, True
@@ -242,6 +235,11 @@ def theme_paul_tol(reverse_colors=False, grid=True, ticks=True, figsize=None, fo
     fontsize : int or float, None
         Sets the font size for plots, for example ``fontsize=12.5``
     """
+    rcmod.set_style(_solarized_style(scheme, grid, ticks, figsize, fontsize))
+
+
+@register_theme("paul_tol")
+def _paul_tol_style(reverse_colors=False, grid=True, ticks=True, figsize=None, fontsize=None):
     if figsize is None:
         figsize = [12.0, 8.0]
     pal_colors = palettes.PaulTolColorSchemes.colors
@@ -249,17 +247,17 @@ def theme_paul_tol(reverse_colors=False, grid=True, ticks=True, figsize=None, fo
         pal_colors = pal_colors[::-1]
     style = rcmod.theme_style(None, pal_colors, grid, ticks, figsize)
     if fontsize is not None:
-        style.update({"font.size": fontsize})
-    rcmod.set_style(style)
+        style = style.override({"font.size": fontsize})
+    return style
 
 
-def theme_few(scheme="medium", grid=False, ticks=True, figsize=None, fontsize=None):
-    """Theme based on the ideas of Stephen Few
+def theme_paul_tol(reverse_colors=False, grid=True, ticks=True, figsize=None, fontsize=None):
+    """Theme based on the defaults in Tableau
     Parameters
     ----------
-    scheme : str, medium, or dark or light
-        Use one of dark or light solarized color schemes
-    grid : bool, False
+    reverse : bool, False
+        Toggle color palette order forward or reverse
+    grid : bool, True
         Toggle gridlines on/off
     axes : bool, True
         Toggle tick marks on/off
@@ -268,6 +266,11 @@ def theme_few(scheme="medium", grid=False, ticks=True, figsize=None, fontsize=No
     fontsize : int or float, None
         Sets the font size for plots, for example ``fontsize=12.5``
     """
+    rcmod.set_style(_paul_tol_style(reverse_colors, grid, ticks, figsize, fontsize))
+
+
+@register_theme("few")
+def _few_style(scheme="medium", grid=False, ticks=True, figsize=None, fontsize=None):
     if figsize is None:
         figsize = [12.0, 8.0]
     if scheme == "medium":
@@ -287,21 +290,16 @@ def theme_few(scheme="medium", grid=False, ticks=True, figsize=None, fontsize=No
     }
     style = rcmod.theme_style(few_style, pal_colors, grid, ticks, figsize)
     if fontsize is not None:
-        style.update({"font.size": fontsize})
-    rcmod.set_style(style)
+        style = style.override({"font.size": fontsize})
+    return style
 
 
-def theme_ucberkeley(scheme="primary", grid=False, ticks=True, figsize=None, fontsize=None):
-    """Theme based on the brand guidelines of Univeristy of California, Berkeley.
-    https://brand.berkeley.edu/
-
-    If you want to use the theme's default font, Open Sans, you may need to 
-    download and install it from: https://www.fontsquirrel.com/fonts/open-sans
-
+def theme_few(scheme="medium", grid=False, ticks=True, figsize=None, fontsize=None):
+    """Theme based on the ideas of Stephen Few
     Parameters
     ----------
-    scheme : str, primary, secondary or all
-        Use one of primary, secondary, or all colors in the UC Berkeley palette
+    scheme : str, medium, or dark or light
+        Use one of dark or light solarized color schemes
     grid : bool, False
         Toggle gridlines on/off
     axes : bool, True
@@ -311,6 +309,11 @@ def theme_ucberkeley(scheme="primary", grid=False, ticks=True, figsize=None, fon
     fontsize : int or float, None
         Sets the font size for plots, for example ``fontsize=12.5``
     """
+    rcmod.set_style(_few_style(scheme, grid, ticks, figsize, fontsize))
+
+
+@register_theme("ucberkeley")
+def _ucberkeley_style(scheme="primary", grid=False, ticks=True, figsize=None, fontsize=None):
     if figsize is None:
         figsize = [12.0, 8.0]
     if scheme == "primary":
@@ -340,8 +343,31 @@ def theme_ucberkeley(scheme="primary", grid=False, ticks=True, figsize=None, fon
     }
     style = rcmod.theme_style(ucb_style, pal_colors, grid, ticks, figsize)
     if fontsize is not None:
-        style.update({"font.size": fontsize})
-    rcmod.set_style(style)
+        style = style.override({"font.size": fontsize})
+    return style
+
+
+def theme_ucberkeley(scheme="primary", grid=False, ticks=True, figsize=None, fontsize=None):
+    """Theme based on the brand guidelines of Univeristy of California, Berkeley.
+    https://brand.berkeley.edu/
+
+    If you want to use the theme's default font, Open Sans, you may need to 
+    download and install it from: https://www.fontsquirrel.com/fonts/open-sans
+
+    Parameters
+    ----------
+    scheme : str, primary, secondary or all
+        Use one of primary, secondary, or all colors in the UC Berkeley palette
+    grid : bool, False
+        Toggle gridlines on/off
+    axes : bool, True
+        Toggle tick marks on/off
+    figsize : list or tuple, None
+        Sets the figsize for plots, for example ``figsize=[9,6]``
+    fontsize : int or float, None
+        Sets the font size for plots, for example ``fontsize=12.5``
+    """
+    rcmod.set_style(_ucberkeley_style(scheme, grid, ticks, figsize, fontsize))
 
 
 def _get_mpl_style_params(style):
@@ -350,13 +376,22 @@ def _get_mpl_style_params(style):
     ----------
     style : str, the name of an existing style from matplotlib.pyplot.style.available
     """
-    if style not in plt.style.available:
+    if style not in mpl_style.available:
         print(f"Style ``{style}`` is not available")
         raise
-    params = {k: v for k, v in plt.style.library.get(style).items()}
+    params = {k: v for k, v in mpl_style.library.get(style).items()}
     return params
 
 
+@register_theme("fivethirtyeight")
+def _fivethirtyeight_style(grid=None, ticks=None, figsize=None, fontsize=None):
+    fivethirtyeight_style = _get_mpl_style_params("fivethirtyeight")
+    style = rcmod.theme_style(fivethirtyeight_style, None, grid, ticks, figsize)
+    if fontsize is not None:
+        style = style.override({"font.size": fontsize})
+    return style
+
+
 def theme_fivethirtyeight(grid=None, ticks=None, figsize=None, fontsize=None):
     """Use the matplotlib fivethirtyeight style
     Parameters
@@ -370,11 +405,16 @@ def theme_fivethirtyeight(grid=None, ticks=None, figsize=None, fontsize=None):
     fontsize : int or float, None
         Sets the font size for plots, for example ``fontsize=12.5``
     """
-    fivethirtyeight_style = _get_mpl_style_params("fivethirtyeight")
-    style = rcmod.theme_style(fivethirtyeight_style, None, grid, ticks, figsize)
+    rcmod.set_style(_fivethirtyeight_style(grid, ticks, figsize, fontsize))
+
+
+@register_theme("ggplot2")
+def _ggplot2_style(palette=None, grid=None, ticks=None, figsize=None, fontsize=None):
+    ggplot_style = _get_mpl_style_params("ggplot")
+    style = rcmod.theme_style(ggplot_style, palette, grid, ticks, figsize)
     if fontsize is not None:
-        style.update({"font.size": fontsize})
-    rcmod.set_style(style)
+        style = style.override({"font.size": fontsize})
+    return style
 
 
 def theme_ggplot2(palette=None, grid=None, ticks=None, figsize=None, fontsize=None):
@@ -392,11 +432,16 @@ def theme_ggplot2(palette=None, grid=None, ticks=None, figsize=None, fontsize=No
     fontsize : int or float, None
         Sets the font size for plots, for example ``fontsize=12.5``
     """
-    ggplot_style = _get_mpl_style_params("ggplot")
-    style = rcmod.theme_style(ggplot_style, palette, grid, ticks, figsize)
+    rcmod.set_style(_ggplot2_style(palette, grid, ticks, figsize, fontsize))
+
+
+@register_theme("solarized_light2")
+def _solarized_light2_style(grid=None, ticks=None, figsize=None, fontsize=None):
+    sl_style = _get_mpl_style_params("Solarize_Light2")
+    style = rcmod.theme_style(sl_style, None, grid, ticks, figsize)
     if fontsize is not None:
-        style.update({"font.size": fontsize})
-    rcmod.set_style(style)
+        style = style.override({"font.size": fontsize})
+    return style
 
 
 def theme_solarized_light2(grid=None, ticks=None, figsize=None, fontsize=None):
@@ -412,11 +457,16 @@ def theme_solarized_light2(grid=None, ticks=None, figsize=None, fontsize=None):
     fontsize : int or float, None
         Sets the font size for plots, for example ``fontsize=12.5``
     """
-    sl_style = _get_mpl_style_params("Solarize_Light2")
-    style = rcmod.theme_style(sl_style, None, grid, ticks, figsize)
+    rcmod.set_style(_solarized_light2_style(grid, ticks, figsize, fontsize))
+
+
+@register_theme("bmh", aliases=("bayesian_methods_for_hackers",))
+def _bmh_style(palette=None, grid=None, ticks=None, figsize=None, fontsize=None):
+    bmh_style = _get_mpl_style_params("bmh")
+    style = rcmod.theme_style(bmh_style, palette, grid, ticks, figsize)
     if fontsize is not None:
-        style.update({"font.size": fontsize})
-    rcmod.set_style(style)
+        style = style.override({"font.size": fontsize})
+    return style
 
 
 def theme_bmh(palette=None, grid=None, ticks=None, figsize=None, fontsize=None):
@@ -432,11 +482,89 @@ def theme_bmh(palette=None, grid=None, ticks=None, figsize=None, fontsize=None):
     fontsize : int or float, None
         Sets the font size for plots, for example ``fontsize=12.5``
     """
-    bmh_style = _get_mpl_style_params("bmh")
-    style = rcmod.theme_style(bmh_style, palette, grid, ticks, figsize)
-    if fontsize is not None:
-        style.update({"font.size": fontsize})
-    rcmod.set_style(style)
+    rcmod.set_style(_bmh_style(palette, grid, ticks, figsize, fontsize))
 
 
 theme_bayesian_methods_for_hackers = theme_bmh
+
+
+def compile_theme(name, *args, **kwargs):
+    """Return the compiled, read-only style dict of a theme without applying it
+    Parameters
+    ----------
+    name : str or function
+        The name of the theme, e.g. ``"dark"``, or the ``theme_dark`` function itself
+    *args, **kwargs
+        The arguments the ``theme_*`` function accepts, e.g. ``scheme="light"``
+    """
+    return get_theme(name)(*args, **kwargs)
+
+
+def theme(name, *args, **kwargs):
+    """Apply a theme only within a ``with`` block
+    On entry only the rcParams the theme sets are saved, and on exit
+    exactly those are restored.
+    Parameters
+    ----------
+    name : str
+        The name of the theme, e.g. ``"dark"`` for ``theme_dark``
+    *args, **kwargs
+        The arguments the ``theme_*`` function accepts, e.g. ``scheme="light"``
+    Examples
+    --------
+    >>> with pyplot_themes.theme("few", scheme="dark"):
+    ...     plt.plot([1, 2, 3])
+    """
+    return rcmod.style_context(compile_theme(name, *args, **kwargs))
+
+
+class Theme:
+    """A theme bound to its arguments
+    Parameters
+    ----------
+    name : str or function
+        The name of the theme, e.g. ``"dark"``, or the ``theme_dark`` function itself
+    *args, **kwargs
+        The arguments the ``theme_*`` function accepts, e.g. ``scheme="light"``
+    Examples
+    --------
+    >>> dark = Theme("few", scheme="dark")
+    >>> fig, ax = dark.new_figure()
+    >>> ax.plot([1, 2, 3])
+    >>> fig.savefig("few-dark.png")
+    """
+
+    def __init__(self, name, *args, **kwargs):
+        self.name = get_theme(name).theme_name
+        self.args = args
+        self.kwargs = kwargs
+
+    def __repr__(self):
+        arguments = [repr(self.name)] + [repr(a) for a in self.args]
+        arguments += [f"{k}={v!r}" for k, v in self.kwargs.items()]
+        return f"Theme({', '.join(arguments)})"
+
+    @property
+    def style(self):
+        """The compiled, read-only style dict"""
+        return compile_theme(self.name, *self.args, **self.kwargs)
+
+    def apply(self):
+        """Apply the theme globally, like calling its ``theme_*`` function"""
+        return rcmod.set_style(self.style)
+
+    def context(self):
+        """Apply the theme only within a ``with`` block, see ``theme``"""
+        return rcmod.style_context(self.style)
+
+    def apply_to(self, fig):
+        """Theme an existing figure and its axes without touching rcParams"""
+        from pyplot_themes import figures
+
+        return figures.apply_style(fig, self.style)
+
+    def new_figure(self, nrows=1, ncols=1, **kwargs):
+        """Create a themed figure and axes without touching rcParams, see ``figures.new_figure``"""
+        from pyplot_themes import figures
+
+        return figures.new_figure(self.style, nrows, ncols, **kwargs)
@@ -0,0 +1,106 @@
+"""Compiled themes whose values were already validated by matplotlib.
+
+Setting ``rcParams[key] = value`` runs matplotlib's validator for the key,
+which parses cyclers, font lists and colors again on every apply although a
+compiled theme never changes. ``ValidatedStyle`` holds the validated values
+together with the matplotlib version that validated them, so ``set_style``
+can write them straight into ``rcParams`` while that version is installed.
+"""
+from collections.abc import Mapping
+from types import MappingProxyType
+
+import matplotlib as mpl
+
+
+# the backend has its own resolution logic in rcParams.__setitem__
+_DEFERRED_KEYS = {"backend"}
+
+
+class ValidatedStyle(Mapping):
+    """A read-only style whose values were validated by one matplotlib version
+    Keys that matplotlib does not know, and the backend, are kept as given
+    in ``deferred`` and always go through ``rcParams.__setitem__``.
+    Parameters
+    ----------
+    values : dict
+        Validated rcParams values
+    deferred : dict, None
+        Values that must be set the normal way
+    matplotlib : str, None
+        The matplotlib version that validated ``values``, the installed one by default
+    name : str, None
+        The theme the style was compiled from
+    """
+
+    __slots__ = ("_values", "_deferred", "matplotlib", "name")
+
+    def __init__(self, values, deferred=None, matplotlib=None, name=None):
+        self._values = dict(values)
+        self._deferred = dict(deferred or {})
+        self.matplotlib = matplotlib or mpl.__version__
+        self.name = name
+
+    @classmethod
+    def validate(cls, style, name=None):
+        """Validate every value of ``style`` with the installed matplotlib
+        Raises
+        ------
+        ValueError
+            If a value is not valid for its rcParam
+        """
+        validators = mpl.rcParams.validate
+        values = {}
+        deferred = {}
+        for key, value in style.items():
+            if key in _DEFERRED_KEYS or key not in validators:
+                deferred[key] = value
+                continue
+            try:
+                values[key] = validators[key](value)
+            except ValueError as error:
+                raise ValueError(f"Key {key}: {error}") from None
+        return cls(values, deferred, name=name)
+
+    @property
+    def is_current(self):
+        """Whether the values were validated by the installed matplotlib"""
+        return self.matplotlib == mpl.__version__
+
+    @property
+    def validated(self):
+        """The validated values, without the deferred ones"""
+        return MappingProxyType(self._values)
+
+    @property
+    def deferred(self):
+        """The values that must be set through ``rcParams.__setitem__``"""
+        return MappingProxyType(self._deferred)
+
+    def subset(self, keys):
+        """Return a ``ValidatedStyle`` with only the given keys, keeping the version"""
+        return ValidatedStyle(
+            {key: self._values[key] for key in keys if key in self._values},
+            {key: self._deferred[key] for key in keys if key in self._deferred},
+            self.matplotlib,
+            self.name,
+        )
+
+    def __getitem__(self, key):
+        if key in self._values:
+            return self._values[key]
+        return self._deferred[key]
+
+    def __contains__(self, key):
+        return key in self._values or key in self._deferred
+
+    def __iter__(self):
+        yield from self._values
+        yield from self._deferred
+
+    def __len__(self):
+        return len(self._values) + len(self._deferred)
+
+    def __repr__(self):
+        return (
+            f"ValidatedStyle({self.name!r}, {len(self)} rcParams, matplotlib {self.matplotlib})"
+        )
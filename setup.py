@@ -27,7 +27,10 @@ REQUIRED = [
 
 # What packages are optional?
 EXTRAS = {
-    # 'fancy feature': ['django'],
+    # KD-tree for nearest_color_names, which falls back to NumPy without it
+    'fast': ['scipy'],
+    # reading image files in palette_from_image, .npy arrays work without it
+    'image': ['pillow'],
 }
 
 # The rest you shouldn't have to touch too much :)